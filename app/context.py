@@ -3,18 +3,30 @@ from dataclasses import dataclass, field
 import tkinter as tk
 from typing import Optional, Tuple, List
 
-@dataclass
+@dataclass(slots=True)
 class AppContext:
-    """Shared application context/data."""
+    """Shared application context/data.
+
+    slots=True keeps the instance compact and turns attribute access into a
+    fixed-offset lookup; any new attribute must be declared here.
+    """
     window: tk.Tk
     canvas: Optional[tk.Canvas] = None
     timer_frame: Optional[tk.Frame] = None
     activity_label: Optional[tk.Label] = None
-    
+
     file_menu: Optional[tk.Menu] = None
     scenario_menu: Optional[tk.Menu] = None
     simulation_menu: Optional[tk.Menu] = None
 
+    # Frames built lazily by the UI modules
+    home_frame: Optional[tk.Frame] = None
+    auto_frame: Optional[tk.Frame] = None
+    activity_frame: Optional[tk.Frame] = None
+
+    # Running manual-simulation timer (None when idle)
+    timer_app_instance: Optional[object] = None
+
     # State variables
     load_active: bool = False
     current_file: Optional[str] = None
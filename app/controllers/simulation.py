@@ -58,21 +58,23 @@ def start_sim(ctx: AppContext):
             lambda event: interaction(ctx.canvas, timer_app_instance, event, ctx.load_active, ctx.activity_label),
         )
 
+    def _on_start():
+        _bind_canvas_click()
+        start_simulation(ctx.canvas, timer_app_instance, ctx.load_active, ctx.activity_label)
+        monitor_activities(ctx.canvas, ctx.load_active, ctx.activity_label, timer_app_instance)
+        start_interaction_log_session(timer_app_instance.get_simulated_time())
+
+    def _on_stop():
+        stop_simulation(timer_app_instance)
+        close_current_activity(timer_app_instance, ctx.activity_label)
+        stop_interaction_log_session()
+        enable_all_menus(ctx)
+        ctx.window.after(100, lambda: _cleanup_manual_sim(ctx))
+
     timer_app_instance = TimerApp(
         ctx.timer_frame,
-        start_callback=lambda: (
-            _bind_canvas_click(),
-            start_simulation(ctx.canvas, timer_app_instance, ctx.load_active, ctx.activity_label),
-            monitor_activities(ctx.canvas, ctx.load_active, ctx.activity_label, timer_app_instance),
-            start_interaction_log_session(timer_app_instance.get_simulated_time()),
-        ),
-        stop_callback=lambda: (
-            stop_simulation(timer_app_instance),
-            close_current_activity(timer_app_instance, ctx.activity_label),
-            stop_interaction_log_session(),
-            enable_all_menus(ctx),
-            ctx.window.after(100, lambda: _cleanup_manual_sim(ctx)),
-        ),
+        start_callback=_on_start,
+        stop_callback=_on_stop,
     )
 
     _bind_canvas_click()
@@ -99,14 +101,25 @@ def start_sim(ctx: AppContext):
     disable_all_menus(ctx)
 
 
+# Labels of the Scenario menu entries toggled while a simulation runs.
+_SCENARIO_MENU_LABELS = ("Add points", "Add sensors", "Add devices", "Add walls", "Add doors")
+
+
+def _set_menus_state(ctx: AppContext, state: str):
+    # entryconfig is a Tcl round trip per entry; skip entries already in the
+    # requested state (frequent when enable/disable is called defensively).
+    menu = ctx.scenario_menu
+    for label in _SCENARIO_MENU_LABELS:
+        if str(menu.entrycget(label, "state")) != state:
+            menu.entryconfig(label, state=state)
+
+
 def disable_all_menus(ctx: AppContext):
-    for label in ["Add points", "Add sensors", "Add devices", "Add walls", "Add doors"]:
-        ctx.scenario_menu.entryconfig(label, state="disabled")
+    _set_menus_state(ctx, "disabled")
 
 
 def enable_all_menus(ctx: AppContext):
-    for label in ["Add points", "Add sensors", "Add devices", "Add walls", "Add doors"]:
-        ctx.scenario_menu.entryconfig(label, state="normal")
+    _set_menus_state(ctx, "normal")
 
 
 def exit_app(ctx: AppContext):
@@ -1,441 +1,834 @@
-"""
-AWS S3 import module for scenario data.
-Requires: boto3, pandas (optional for data transformation)
-Install with: pip install boto3 pandas
-"""
-from __future__ import annotations
-
-import io
-import csv
-import json
-import os
-from typing import Optional, List, Dict, Any
-from tkinter import messagebox
-import tkinter as tk
-from tkinter import ttk
-
-try:
-    import boto3
-    from botocore.exceptions import ClientError, NoCredentialsError
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
-
-from app.logging_setup import setup_logging
-from app.save_paths import ensure_devices_dir
-
-logger = setup_logging("io.aws_import")
-
-
-class AWSS3Importer:
-    """Handle AWS S3 connections and data import."""
-    
-    def __init__(self, aws_access_key: Optional[str] = None,
-                 aws_secret_key: Optional[str] = None,
-                 region_name: str = 'eu-central-1'):
-        """
-        Initialize AWS S3 client.
-        If credentials are None, will use default AWS credentials (env vars, ~/.aws/credentials, IAM role).
-        """
-        if not BOTO3_AVAILABLE:
-            raise ImportError("boto3 not installed. Run: pip install boto3")
-        
-        try:
-            if aws_access_key and aws_secret_key:
-                self.s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=aws_access_key,
-                    aws_secret_access_key=aws_secret_key,
-                    region_name=region_name
-                )
-            else:
-                # Use default credentials
-                self.s3_client = boto3.client('s3', region_name=region_name)
-            
-            logger.info("AWS S3 client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize AWS S3 client: {e}")
-            raise
-    
-    def list_buckets(self) -> List[str]:
-        """List all available S3 buckets."""
-        try:
-            response = self.s3_client.list_buckets()
-            buckets = [bucket['Name'] for bucket in response.get('Buckets', [])]
-            logger.info(f"Found {len(buckets)} S3 buckets")
-            return buckets
-        except NoCredentialsError as e:
-            logger.error("No AWS credentials found")
-            raise Exception("No AWS credentials configured. Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables or enter credentials manually.")
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-            error_msg = e.response.get('Error', {}).get('Message', str(e))
-            logger.error(f"AWS S3 Error ({error_code}): {error_msg}")
-            
-            if error_code == 'AccessDenied':
-                raise Exception(f"Access Denied: Your IAM user/role needs 's3:ListAllMyBuckets' permission.\n\nError: {error_msg}")
-            elif error_code == 'InvalidAccessKeyId':
-                raise Exception(f"Invalid Access Key ID. Please check your credentials.\n\nError: {error_msg}")
-            elif error_code == 'SignatureDoesNotMatch':
-                raise Exception(f"Invalid Secret Key. Please check your credentials.\n\nError: {error_msg}")
-            else:
-                raise Exception(f"AWS Error ({error_code}): {error_msg}")
-        except Exception as e:
-            logger.error(f"Error listing buckets: {e}")
-            raise Exception(f"Failed to list S3 buckets: {str(e)}")
-    
-    def list_objects(self, bucket_name: str, prefix: str = '') -> List[str]:
-        """List **all** objects in a specific bucket with optional prefix (handles pagination)."""
-        try:
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
-
-            objects: List[str] = []
-            for page in page_iterator:
-                contents = page.get('Contents', [])
-                if contents:
-                    objects.extend(obj['Key'] for obj in contents)
-
-            logger.info(
-                f"Found {len(objects)} objects in bucket '{bucket_name}'" +
-                (f" with prefix '{prefix}'" if prefix else "")
-            )
-            return objects
-        except Exception as e:
-            logger.error(f"Error listing objects in bucket '{bucket_name}': {e}")
-            return []
-    
-    def download_csv_file(self, bucket_name: str, key: str) -> Optional[str]:
-        """Download CSV file from S3 and return content as string."""
-        try:
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=key)
-            content = response['Body'].read().decode('utf-8')
-            return content
-        except Exception as e:
-            logger.error(f"Error downloading '{key}' from '{bucket_name}': {e}")
-            return None
-    
-    def download_json_file(self, bucket_name: str, key: str) -> Optional[Dict[str, Any]]:
-        """Download JSON file from S3 and return as dictionary."""
-        try:
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=key)
-            content = response['Body'].read().decode('utf-8')
-            data = json.loads(content)
-            logger.info(f"Downloaded JSON file '{key}' from bucket '{bucket_name}'")
-            return data
-        except Exception as e:
-            logger.error(f"Error downloading JSON '{key}' from '{bucket_name}': {e}")
-            return None
-    
-    def save_to_local_csv(self, content: str, local_path: str) -> bool:
-        """Save downloaded content to local CSV file."""
-        try:
-            with open(local_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            logger.info(f"Saved content to '{local_path}'")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving to '{local_path}': {e}")
-            return False
-
-
-def transform_grafana_to_scenario(grafana_data: Dict[str, Any]) -> str:
-    """
-    Transform Grafana/TwinMaker time-series data to scenario CSV format.
-    This is a template - customize based on your actual data structure.
-    """
-    # TODO: Customize based on your Grafana data structure
-    csv_lines = []
-    csv_lines.append("Positions")
-    
-    # Example: if grafana_data contains sensor positions
-    if 'sensors' in grafana_data:
-        for sensor in grafana_data['sensors']:
-            # Assuming sensor has: name, x, y, type, etc.
-            pass
-    
-    csv_lines.append("")
-    csv_lines.append("Walls")
-    # Add wall data transformation...
-    
-    csv_lines.append("")
-    csv_lines.append("Sensors")
-    # Add sensor data transformation...
-    
-    csv_lines.append("")
-    csv_lines.append("Devices")
-    # Add device data transformation...
-    
-    csv_lines.append("")
-    csv_lines.append("Doors")
-    # Add door data transformation...
-    
-    return "\n".join(csv_lines)
-
-
-class AWSS3ImportUI:
-    """UI for AWS S3 import."""
-    
-    def __init__(self, parent: tk.Tk):
-        self.parent = parent
-        self.window = tk.Toplevel(parent)
-        self.window.title("Import from AWS S3")
-        self.window.geometry("800x650")
-        self.window.resizable(True, True)
-        
-        self.importer: Optional[AWSS3Importer] = None
-        self.selected_bucket = None
-        self.selected_file = None
-        
-        self._build_ui()
-    
-    def _build_ui(self):
-        # Check boto3 availability
-        if not BOTO3_AVAILABLE:
-            tk.Label(
-                self.window,
-                text="❌ boto3 not installed\nRun: pip install boto3",
-                fg="red",
-                font=("Arial", 12)
-            ).pack(pady=20)
-            tk.Button(self.window, text="Close", command=self.window.destroy).pack()
-            return
-        
-        # Credentials Frame
-        cred_frame = tk.LabelFrame(self.window, text="AWS Credentials", padx=10, pady=10)
-        cred_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        tk.Label(cred_frame, text="Access Key (leave empty for default):").grid(row=0, column=0, sticky="w")
-        self.access_key_entry = tk.Entry(cred_frame, width=40, show="*")
-        self.access_key_entry.grid(row=0, column=1, padx=5, pady=2)
-        
-        tk.Label(cred_frame, text="Secret Key (leave empty for default):").grid(row=1, column=0, sticky="w")
-        self.secret_key_entry = tk.Entry(cred_frame, width=40, show="*")
-        self.secret_key_entry.grid(row=1, column=1, padx=5, pady=2)
-        
-        tk.Label(cred_frame, text="Region:").grid(row=2, column=0, sticky="w")
-        self.region_entry = tk.Entry(cred_frame, width=40)
-        self.region_entry.insert(0, "us-east-1")
-        self.region_entry.grid(row=2, column=1, padx=5, pady=2)
-        
-        tk.Button(cred_frame, text="Connect", command=self._connect_to_aws).grid(row=3, column=1, pady=5, sticky="e")
-        
-        # Buckets Frame
-        bucket_frame = tk.LabelFrame(self.window, text="S3 Buckets", padx=10, pady=10)
-        bucket_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        tk.Label(bucket_frame, text="Select Bucket (or enter manually below):").pack(anchor="w")
-        self.bucket_listbox = tk.Listbox(bucket_frame, height=5)
-        self.bucket_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.bucket_listbox.bind('<<ListboxSelect>>', self._on_bucket_select)
-        
-        # Manual bucket entry
-        manual_frame = tk.Frame(bucket_frame)
-        manual_frame.pack(fill=tk.X, pady=5)
-        tk.Label(manual_frame, text="Or enter bucket name:").pack(side="left", padx=5)
-        self.manual_bucket_entry = tk.Entry(manual_frame, width=30)
-        self.manual_bucket_entry.pack(side="left", padx=5)
-        tk.Button(manual_frame, text="Use This Bucket", command=self._use_manual_bucket).pack(side="left", padx=5)
-        
-        # Files Frame
-        files_frame = tk.LabelFrame(self.window, text="Files in Bucket", padx=10, pady=10)
-        files_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        tk.Label(files_frame, text="Select File:").pack(anchor="w")
-        self.files_listbox = tk.Listbox(files_frame, height=5)
-        self.files_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.files_listbox.bind('<<ListboxSelect>>', self._on_file_select)
-        
-        # Action Buttons
-        btn_frame = tk.Frame(self.window)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        tk.Button(btn_frame, text="Import as Scenario", command=self._import_scenario, state="disabled").pack(side="left", padx=5)
-        self.import_btn = btn_frame.winfo_children()[0]
-        
-        tk.Button(btn_frame, text="Download to File", command=self._download_to_file, state="disabled").pack(side="left", padx=5)
-        self.download_btn = btn_frame.winfo_children()[1]
-        
-        tk.Button(btn_frame, text="Close", command=self.window.destroy).pack(side="right", padx=5)
-        
-        # Status
-        self.status_label = tk.Label(self.window, text="Status: Not connected", fg="gray")
-        self.status_label.pack(pady=5)
-    
-    def _connect_to_aws(self):
-        access_key = self.access_key_entry.get().strip() or None
-        secret_key = self.secret_key_entry.get().strip() or None
-        region = self.region_entry.get().strip() or "us-east-1"
-        
-        try:
-            self.importer = AWSS3Importer(access_key, secret_key, region)
-            self.status_label.config(text="Status: Connected ✓", fg="green")
-            self._load_buckets()
-        except Exception as e:
-            messagebox.showerror("Connection Error", f"Failed to connect to AWS:\n{str(e)}")
-            self.status_label.config(text="Status: Connection failed ✗", fg="red")
-    
-    def _load_buckets(self):
-        if not self.importer:
-            return
-        
-        try:
-            buckets = self.importer.list_buckets()
-            self.bucket_listbox.delete(0, tk.END)
-            for bucket in buckets:
-                self.bucket_listbox.insert(tk.END, bucket)
-            
-            if not buckets:
-                messagebox.showinfo(
-                    "No Buckets", 
-                    "No S3 buckets found.\n\nIf you know the bucket name, enter it manually below."
-                )
-        except Exception as e:
-            error_msg = str(e)
-            if "AccessDenied" in error_msg or "not authorized" in error_msg:
-                messagebox.showinfo(
-                    "Permission Required",
-                    "Your IAM user lacks 's3:ListAllMyBuckets' permission.\n\n"
-                    "You can still use S3 by entering the bucket name manually below."
-                )
-            else:
-                messagebox.showerror("Error", f"Failed to list buckets:\n{error_msg}")
-    
-    def _on_bucket_select(self, event):
-        selection = self.bucket_listbox.curselection()
-        if not selection:
-            return
-        
-        self.selected_bucket = self.bucket_listbox.get(selection[0])
-        self.manual_bucket_entry.delete(0, tk.END)
-        self.manual_bucket_entry.insert(0, self.selected_bucket)
-        self._load_files()
-    
-    def _use_manual_bucket(self):
-        bucket = self.manual_bucket_entry.get().strip()
-        if not bucket:
-            messagebox.showwarning("Bucket Required", "Please enter a bucket name.")
-            return
-        
-        self.selected_bucket = bucket
-        self.status_label.config(text=f"Using bucket: {bucket}", fg="blue")
-        self._load_files()
-    
-    def _load_files(self):
-        if not self.importer or not self.selected_bucket:
-            return
-        
-        self.status_label.config(text=f"Loading files from '{self.selected_bucket}'...", fg="blue")
-        self.window.update()
-        
-        try:
-            files = self.importer.list_objects(self.selected_bucket)
-            self.files_listbox.delete(0, tk.END)
-            
-            csv_json = [f for f in files if f.endswith(('.csv', '.json'))]
-            for file in csv_json:
-                self.files_listbox.insert(tk.END, file)
-            
-            if not csv_json:
-                self.status_label.config(text=f"No CSV/JSON files in '{self.selected_bucket}'", fg="orange")
-                messagebox.showinfo("No Files", f"No CSV/JSON files found in bucket '{self.selected_bucket}'.")
-            else:
-                self.status_label.config(text=f"Loaded {len(csv_json)} file(s) from '{self.selected_bucket}'", fg="green")
-        except Exception as e:
-            self.status_label.config(text="Failed to list files", fg="red")
-            msg = str(e)
-            if "NoSuchBucket" in msg:
-                messagebox.showerror("Bucket Not Found", f"Bucket '{self.selected_bucket}' does not exist or is not accessible.")
-            elif "AccessDenied" in msg:
-                messagebox.showerror("Access Denied", f"Missing permission s3:ListBucket on '{self.selected_bucket}'.")
-            else:
-                messagebox.showerror("Error", f"Failed to list files:\n{msg}")
-    
-    def _on_file_select(self, event):
-        selection = self.files_listbox.curselection()
-        if not selection:
-            return
-        
-        self.selected_file = self.files_listbox.get(selection[0])
-        self.import_btn.config(state="normal")
-        self.download_btn.config(state="normal")
-    
-    def _import_scenario(self):
-        if not self.importer or not self.selected_bucket or not self.selected_file:
-            messagebox.showwarning("Selection Required", "Please select a bucket and file.")
-            return
-        
-        self.status_label.config(text=f"Downloading '{self.selected_file}'...", fg="blue")
-        self.window.update()
-        
-        content = self.importer.download_csv_file(self.selected_bucket, self.selected_file)
-        if content:
-            # Ask for file type/name to determine the save path
-            file_type = messagebox.askquestion(
-                "File Type",
-                "Is this a TEMPERATURE sensor file (like t1, t2, etc.)?\n\n"
-                "Click YES to save as dht_<name>.csv\n"
-                "Click NO to save as saved.csv (for scenarios)"
-            )
-            
-            if file_type == 'yes':
-                # Ask for the sensor name
-                from tkinter import simpledialog
-                sensor_name = simpledialog.askstring(
-                    "Sensor Name",
-                    "Enter sensor name (e.g., t1, t2, bedroom_temp):"
-                )
-                
-                if sensor_name:
-                    sensor_name = sensor_name.strip()
-                    local_path = os.path.join(str(ensure_devices_dir()), f"dht_{sensor_name}.csv")
-                else:
-                    messagebox.showwarning("Cancelled", "Import cancelled.")
-                    self.status_label.config(text="Import cancelled", fg="orange")
-                    return
-            else:
-                local_path = "saved.csv"
-            
-            if self.importer.save_to_local_csv(content, local_path):
-                messagebox.showinfo("Success", f"Imported '{self.selected_file}' to {local_path}\n\nUse File → Load default to open it.")
-                self.status_label.config(text="Import successful ✓", fg="green")
-                self.window.destroy()
-            else:
-                messagebox.showerror("Error", "Failed to save imported data.")
-                self.status_label.config(text="Import failed ✗", fg="red")
-        else:
-            messagebox.showerror("Error", "Failed to download file from S3.")
-            self.status_label.config(text="Download failed ✗", fg="red")
-    
-    def _download_to_file(self):
-        from tkinter import filedialog
-        
-        if not self.importer or not self.selected_bucket or not self.selected_file:
-            messagebox.showwarning("Selection Required", "Please select a bucket and file.")
-            return
-        
-        local_path = filedialog.asksaveasfilename(
-            title="Save As",
-            defaultextension=".csv",
-            initialfile=self.selected_file,
-            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("All files", "*.*")]
-        )
-        
-        if not local_path:
-            return
-        
-        self.status_label.config(text=f"Downloading '{self.selected_file}'...", fg="blue")
-        self.window.update()
-        
-        content = self.importer.download_csv_file(self.selected_bucket, self.selected_file)
-        if content and self.importer.save_to_local_csv(content, local_path):
-            messagebox.showinfo("Success", f"Downloaded to:\n{local_path}")
-            self.status_label.config(text="Download successful ✓", fg="green")
-        else:
-            messagebox.showerror("Error", "Failed to download file.")
-            self.status_label.config(text="Download failed ✗", fg="red")
-
-
-def open_aws_import_ui(parent: tk.Tk):
-    """Open the AWS S3 import dialog."""
-    AWSS3ImportUI(parent)
+"""
+AWS S3 import module for scenario data.
+Requires: boto3, pandas (optional for data transformation)
+Install with: pip install boto3 pandas
+"""
+from __future__ import annotations
+
+import io
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any
+from tkinter import messagebox
+import tkinter as tk
+from tkinter import ttk
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+    from botocore.exceptions import ClientError, NoCredentialsError
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+# Opt-in: http.client reads server responses through an 8 KiB buffer, which
+# means hundreds of thousands of GIL crossings per 100 MB downloaded. Setting
+# AWS_IMPORT_LARGE_BUF raises the default blocksize to 1 MiB. Process-global
+# (it affects every urllib3/boto3 user in this interpreter), hence the gate.
+if os.environ.get('AWS_IMPORT_LARGE_BUF'):
+    from http.client import HTTPConnection
+    HTTPConnection.__init__.__defaults__ = tuple(
+        1024 * 1024 if x == 8192 else x
+        for x in HTTPConnection.__init__.__defaults__
+    )
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads  # parses raw bytes in C, no separate utf-8 decode pass
+except ImportError:
+    _json_loads = json.loads
+
+from app.logging_setup import setup_logging
+from app.save_paths import ensure_devices_dir
+
+logger = setup_logging("io.aws_import")
+
+# Clients kept for the whole session, keyed by (access-key fingerprint,
+# region). Rebuilding one per connect repeats credential resolution and
+# endpoint discovery, and throws away the warm urllib3 pool (TLS sessions
+# included). botocore clients are thread-safe, so sharing is fine.
+_CLIENT_CACHE: Dict[tuple, Any] = {}
+
+
+class AWSS3Importer:
+    """Handle AWS S3 connections and data import."""
+
+    # File types the import UI understands; built once instead of per call.
+    ACCEPTED_SUFFIXES = ('.csv', '.json')
+
+    def __init__(self, aws_access_key: Optional[str] = None,
+                 aws_secret_key: Optional[str] = None,
+                 region_name: str = 'eu-central-1',
+                 max_concurrency: int = 10):
+        """
+        Initialize AWS S3 client.
+        If credentials are None, will use default AWS credentials (env vars, ~/.aws/credentials, IAM role).
+        max_concurrency controls how many parallel ranged GETs a multipart
+        download may use (worth raising on high-RTT links).
+        """
+        if not BOTO3_AVAILABLE:
+            raise ImportError("boto3 not installed. Run: pip install boto3")
+
+        # LIST results served from memory for a minute: toggling between
+        # buckets in the UI otherwise re-issues an identical multi-second LIST
+        # on every click.
+        self._list_cache: Dict[tuple, tuple] = {}
+        self._list_cache_ttl = 60.0
+
+        # Files above the threshold are fetched as parallel ranged GETs instead
+        # of a single TCP stream, which is the dominant cost for big objects.
+        self._transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+            # 1 MiB reads from the streaming body instead of the 256 KiB
+            # default: fewer syscalls and fewer GIL bounces per downloaded MB.
+            io_chunksize=1024 * 1024,
+        )
+        
+        cache_key = (
+            hashlib.sha256((aws_access_key or '').encode()).hexdigest()[:8],
+            region_name,
+        )
+        cached_client = _CLIENT_CACHE.get(cache_key)
+        if cached_client is not None:
+            self.s3_client = cached_client
+            logger.info("Reusing cached AWS S3 client for region '%s'" % region_name)
+            return
+
+        # Botocore defaults to a 10-connection pool and legacy retries; the
+        # pool would cap the parallel ranged GETs above, and adaptive retries
+        # back off more sensibly on transient 503 SlowDown responses.
+        client_config = Config(
+            max_pool_connections=32,
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            tcp_keepalive=True,
+            connect_timeout=10,
+            read_timeout=60,
+        )
+
+        try:
+            if aws_access_key and aws_secret_key:
+                self.s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=aws_access_key,
+                    aws_secret_access_key=aws_secret_key,
+                    region_name=region_name,
+                    config=client_config
+                )
+            else:
+                # Use default credentials
+                self.s3_client = boto3.client('s3', region_name=region_name,
+                                              config=client_config)
+            
+            _CLIENT_CACHE[cache_key] = self.s3_client
+            logger.info("AWS S3 client initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize AWS S3 client: {e}")
+            raise
+    
+    def _cache_get(self, key: tuple) -> Optional[list]:
+        entry = self._list_cache.get(key)
+        if entry and time.monotonic() - entry[0] < self._list_cache_ttl:
+            return entry[1]
+        return None
+
+    def _cache_put(self, key: tuple, value: list) -> None:
+        self._list_cache[key] = (time.monotonic(), value)
+
+    def refresh(self) -> None:
+        """Drop cached LIST results so the next calls hit S3 again."""
+        self._list_cache.clear()
+
+    def list_buckets(self) -> List[str]:
+        """List all available S3 buckets (cached for a short TTL)."""
+        cached = self._cache_get(('buckets',))
+        if cached is not None:
+            return cached
+        try:
+            response = self.s3_client.list_buckets()
+            buckets = [bucket['Name'] for bucket in response.get('Buckets', [])]
+            logger.info(f"Found {len(buckets)} S3 buckets")
+            self._cache_put(('buckets',), buckets)
+            return buckets
+        except NoCredentialsError as e:
+            logger.error("No AWS credentials found")
+            raise Exception("No AWS credentials configured. Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables or enter credentials manually.")
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            error_msg = e.response.get('Error', {}).get('Message', str(e))
+            logger.error(f"AWS S3 Error ({error_code}): {error_msg}")
+            
+            if error_code == 'AccessDenied':
+                raise Exception(f"Access Denied: Your IAM user/role needs 's3:ListAllMyBuckets' permission.\n\nError: {error_msg}")
+            elif error_code == 'InvalidAccessKeyId':
+                raise Exception(f"Invalid Access Key ID. Please check your credentials.\n\nError: {error_msg}")
+            elif error_code == 'SignatureDoesNotMatch':
+                raise Exception(f"Invalid Secret Key. Please check your credentials.\n\nError: {error_msg}")
+            else:
+                raise Exception(f"AWS Error ({error_code}): {error_msg}")
+        except Exception as e:
+            logger.error(f"Error listing buckets: {e}")
+            raise Exception(f"Failed to list S3 buckets: {str(e)}")
+    
+    def list_objects(self, bucket_name: str, prefix: str = '',
+                     suffixes: Optional[tuple] = None) -> List[str]:
+        """List **all** objects in a specific bucket with optional prefix (handles pagination).
+
+        If 'suffixes' is given, keys are filtered (case-insensitively) while the
+        pages stream in, so no second pass over the full key list is needed.
+        Results are cached for a short TTL; call refresh() to force a re-LIST.
+        """
+        cache_key = (bucket_name, prefix, suffixes)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            page_iterator = paginator.paginate(
+                Bucket=bucket_name, Prefix=prefix,
+                PaginationConfig={'PageSize': 1000}
+            )
+
+            objects: List[str] = []
+            for page in page_iterator:
+                contents = page.get('Contents', [])
+                if not contents:
+                    continue
+                if suffixes:
+                    objects.extend(
+                        obj['Key'] for obj in contents
+                        if obj['Key'].lower().endswith(suffixes)
+                    )
+                else:
+                    objects.extend(obj['Key'] for obj in contents)
+
+            logger.info(
+                f"Found {len(objects)} objects in bucket '{bucket_name}'" +
+                (f" with prefix '{prefix}'" if prefix else "")
+            )
+            self._cache_put(cache_key, objects)
+            return objects
+        except Exception as e:
+            logger.error(f"Error listing objects in bucket '{bucket_name}': {e}")
+            return []
+    
+    def list_objects_parallel(self, bucket_name: str, prefixes: List[str],
+                              max_workers: int = 16,
+                              suffixes: Optional[tuple] = None) -> List[str]:
+        """List objects under several disjoint prefixes concurrently.
+
+        Listing is serial at ~1000 keys per round trip; fanning out over
+        prefix shards cuts wall time roughly linearly with shard count.
+        botocore clients are thread-safe, so the workers share self.s3_client.
+        """
+        objects: List[str] = []
+        with ThreadPoolExecutor(max_workers=min(max_workers, max(1, len(prefixes)))) as pool:
+            results = pool.map(
+                lambda p: self.list_objects(bucket_name, prefix=p, suffixes=suffixes),
+                prefixes
+            )
+            for keys in results:
+                objects.extend(keys)
+        return objects
+
+    def download_csv_file(self, bucket_name: str, key: str) -> Optional[str]:
+        """Download CSV file from S3 and return content as string."""
+        try:
+            buf = io.BytesIO()
+            self.s3_client.download_fileobj(bucket_name, key, buf, Config=self._transfer_config)
+            return buf.getvalue().decode('utf-8')
+        except Exception as e:
+            logger.error(f"Error downloading '{key}' from '{bucket_name}': {e}")
+            return None
+    
+    def download_json_file(self, bucket_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Download JSON file from S3 and return as dictionary."""
+        try:
+            buf = io.BytesIO()
+            self.s3_client.download_fileobj(bucket_name, key, buf, Config=self._transfer_config)
+            data = _json_loads(buf.getvalue())
+            logger.info(f"Downloaded JSON file '{key}' from bucket '{bucket_name}'")
+            return data
+        except Exception as e:
+            logger.error(f"Error downloading JSON '{key}' from '{bucket_name}': {e}")
+            return None
+    
+    def download_ranged(self, bucket_name: str, key: str,
+                        part_size: int = 8 * 1024 * 1024,
+                        concurrency: int = 16) -> Optional[bytes]:
+        """Download one large object as parallel ranged GETs into memory.
+
+        HEADs the object for its size, preallocates a bytearray and fills it
+        from 'concurrency' concurrent byte-range requests. Useful for the
+        in-memory paths where per-part throughput, not disk, is the limit.
+        """
+        try:
+            size = self.s3_client.head_object(Bucket=bucket_name, Key=key)['ContentLength']
+            buf = bytearray(size)
+            nparts = max(1, (size + part_size - 1) // part_size)
+
+            def fetch(i: int):
+                start = i * part_size
+                end = min(start + part_size, size) - 1
+                resp = self.s3_client.get_object(
+                    Bucket=bucket_name, Key=key, Range=f'bytes={start}-{end}'
+                )
+                buf[start:end + 1] = resp['Body'].read()
+
+            with ThreadPoolExecutor(max_workers=min(concurrency, nparts)) as pool:
+                list(pool.map(fetch, range(nparts)))
+            return bytes(buf)
+        except Exception as e:
+            logger.error(f"Ranged download of '{key}' from '{bucket_name}' failed: {e}")
+            return None
+
+    def select_csv(self, bucket_name: str, key: str, sql: str) -> Optional[str]:
+        """Run an S3 Select query against a CSV object and return the result.
+
+        Pushes row/column filtering server-side, so only the matching subset
+        is transferred instead of the full object. Returns None on failure;
+        callers should fall back to download_csv_file.
+        """
+        try:
+            resp = self.s3_client.select_object_content(
+                Bucket=bucket_name,
+                Key=key,
+                Expression=sql,
+                ExpressionType='SQL',
+                InputSerialization={'CSV': {'FileHeaderInfo': 'NONE'}},
+                OutputSerialization={'CSV': {}},
+            )
+            chunks = []
+            for event in resp['Payload']:
+                if 'Records' in event:
+                    chunks.append(event['Records']['Payload'])
+            return b''.join(chunks).decode('utf-8')
+        except Exception as e:
+            logger.error(f"S3 Select on '{key}' from '{bucket_name}' failed: {e}")
+            return None
+
+    def head_object(self, bucket_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """HEAD an object: metadata (ETag, ContentLength, ...) without the body."""
+        try:
+            return self.s3_client.head_object(Bucket=bucket_name, Key=key)
+        except Exception as e:
+            logger.error(f"Error heading '{key}' in '{bucket_name}': {e}")
+            return None
+
+    def download_to_path(self, bucket_name: str, key: str, local_path: str) -> bool:
+        """Download an object straight to disk, without materializing it in memory.
+
+        A '<path>.etag' sidecar remembers what was last fetched; when the
+        remote ETag still matches and the file exists, the transfer is
+        skipped entirely — a HEAD is the cheapest possible refresh. (For
+        multipart uploads the ETag is a hash-of-hashes, which is still a
+        stable identity for this purpose.)
+        """
+        etag_path = local_path + '.etag'
+        remote_etag = None
+        head = self.head_object(bucket_name, key)
+        if head:
+            remote_etag = head.get('ETag')
+            if remote_etag and os.path.exists(local_path):
+                try:
+                    with open(etag_path, 'r', encoding='utf-8') as f:
+                        if f.read().strip() == remote_etag:
+                            logger.info(f"'{local_path}' already matches '{key}' (ETag), skipping download")
+                            return True
+                except OSError:
+                    pass
+
+        try:
+            self.s3_client.download_file(bucket_name, key, local_path, Config=self._transfer_config)
+            logger.info(f"Downloaded '{key}' from '{bucket_name}' to '{local_path}'")
+            if remote_etag:
+                try:
+                    with open(etag_path, 'w', encoding='utf-8') as f:
+                        f.write(remote_etag)
+                except OSError as e:
+                    logger.warning(f"Could not write ETag sidecar for '{local_path}': {e}")
+            return True
+        except Exception as e:
+            logger.error(f"Error downloading '{key}' to '{local_path}': {e}")
+            return False
+
+    def save_to_local_csv(self, content: str | bytes, local_path: str) -> bool:
+        """Save downloaded content to local CSV file.
+
+        bytes are written verbatim ('wb'), skipping the re-encode pass that a
+        decoded str would pay; str is still accepted for the legacy callers.
+        For .csv files a '<path>.dtypes.json' sidecar with the inferred column
+        types is written alongside, so later pandas reads can skip inference
+        (see read_csv_with_sidecar).
+        """
+        try:
+            if isinstance(content, (bytes, bytearray)):
+                with open(local_path, 'wb') as f:
+                    f.write(content)
+            else:
+                with open(local_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            logger.info(f"Saved content to '{local_path}'")
+            if local_path.lower().endswith('.csv'):
+                self._write_dtypes_sidecar(content, local_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving to '{local_path}': {e}")
+            return False
+
+    @staticmethod
+    def _write_dtypes_sidecar(content: str | bytes, local_path: str) -> None:
+        """Best effort: persist inferred column dtypes next to the CSV."""
+        try:
+            if isinstance(content, (bytes, bytearray)):
+                content = content.decode('utf-8')
+            dtypes = _infer_csv_dtypes(content)
+            if dtypes:
+                with open(local_path + '.dtypes.json', 'w', encoding='utf-8') as f:
+                    json.dump(dtypes, f)
+        except Exception as e:
+            logger.warning(f"Could not write dtypes sidecar for '{local_path}': {e}")
+
+
+def _infer_csv_dtypes(text: str, max_rows: int = 1000) -> Dict[str, str]:
+    """Infer a pandas dtype per column from the first 'max_rows' data rows.
+
+    Single pass with csv.reader; each column starts as int64 and is demoted
+    to float64 or object as soon as a value does not fit.
+    """
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if not header:
+        return {}
+    kinds = ['int64'] * len(header)
+    for i, row in enumerate(reader):
+        if i >= max_rows:
+            break
+        for col, value in enumerate(row[:len(header)]):
+            if kinds[col] == 'object':
+                continue
+            try:
+                int(value)
+            except ValueError:
+                try:
+                    float(value)
+                except ValueError:
+                    kinds[col] = 'object'
+                else:
+                    kinds[col] = 'float64'
+    return dict(zip(header, kinds))
+
+
+def read_csv_with_sidecar(local_path: str):
+    """Read a CSV written by save_to_local_csv, using its dtype sidecar.
+
+    With explicit dtypes (and the pyarrow engine where installed) pandas
+    skips type inference entirely, which dominates parse time on big files.
+    Falls back to a plain read_csv when the sidecar or pyarrow is missing.
+    """
+    if not PANDAS_AVAILABLE:
+        raise ImportError("pandas not installed. Run: pip install pandas")
+
+    kwargs: Dict[str, Any] = {}
+    try:
+        with open(local_path + '.dtypes.json', 'r', encoding='utf-8') as f:
+            kwargs['dtype'] = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        return pd.read_csv(local_path, engine='pyarrow', **kwargs)
+    except (ImportError, ValueError):
+        return pd.read_csv(local_path, **kwargs)
+
+
+# Rows per section above which pandas' C CSV writer beats csv.writer;
+# below it, DataFrame construction overhead dominates.
+_PANDAS_SECTION_MIN_ROWS = 10_000
+
+
+def transform_grafana_to_scenario(grafana_data: Dict[str, Any]) -> str:
+    """
+    Transform Grafana/TwinMaker time-series data to scenario CSV format.
+    This is a template - customize based on your actual data structure.
+
+    Rows are streamed through csv.writer into a StringIO: the C csv module
+    formats each row in place, so there is no per-row string list and no
+    final O(n) join over the whole document. Sections with many rows are
+    handed to pandas' (also C-level, but faster on bulk data) CSV writer
+    when pandas is installed.
+    """
+    # TODO: map each payload dict to the row layout the scenario loader
+    # expects (e.g. sensor -> name, x, y, type, ...).
+    sections = (
+        ("Positions", grafana_data.get('sensors', [])),
+        ("Walls", grafana_data.get('walls', [])),
+        ("Sensors", grafana_data.get('sensors', [])),
+        ("Devices", grafana_data.get('devices', [])),
+        ("Doors", grafana_data.get('doors', [])),
+    )
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    for i, (title, rows) in enumerate(sections):
+        if i:
+            writer.writerow([])
+        writer.writerow([title])
+        if PANDAS_AVAILABLE and len(rows) >= _PANDAS_SECTION_MIN_ROWS:
+            pd.DataFrame(rows).to_csv(buf, index=False, header=False, lineterminator='\n')
+        else:
+            # Emit dict values as cells, matching what DataFrame(rows)
+            # serializes on the bulk branch.
+            writer.writerows(
+                r.values() if isinstance(r, dict) else r for r in rows)
+
+    return buf.getvalue()
+
+
+class AWSS3ImportUI:
+    """UI for AWS S3 import."""
+    
+    def __init__(self, parent: tk.Tk):
+        self.parent = parent
+        self.window = tk.Toplevel(parent)
+        self.window.title("Import from AWS S3")
+        self.window.geometry("800x650")
+        self.window.resizable(True, True)
+        
+        self.importer: Optional[AWSS3Importer] = None
+        self.selected_bucket = None
+        self.selected_file = None
+        
+        # Network work (connect/list) runs here and posts results back onto
+        # the Tk loop via window.after(), so the dialog never freezes.
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        # Rolling prefetch: the selected file starts downloading while the
+        # user is still deciding which button to press.
+        self._prefetch_future = None
+        self._prefetch_key = None
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        self._build_ui()
+    
+    def _on_close(self):
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self.window.destroy()
+    
+    def _build_ui(self):
+        # Check boto3 availability
+        if not BOTO3_AVAILABLE:
+            tk.Label(
+                self.window,
+                text="❌ boto3 not installed\nRun: pip install boto3",
+                fg="red",
+                font=("Arial", 12)
+            ).pack(pady=20)
+            tk.Button(self.window, text="Close", command=self.window.destroy).pack()
+            return
+        
+        # Credentials Frame
+        cred_frame = tk.LabelFrame(self.window, text="AWS Credentials", padx=10, pady=10)
+        cred_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        tk.Label(cred_frame, text="Access Key (leave empty for default):").grid(row=0, column=0, sticky="w")
+        self.access_key_entry = tk.Entry(cred_frame, width=40, show="*")
+        self.access_key_entry.grid(row=0, column=1, padx=5, pady=2)
+        
+        tk.Label(cred_frame, text="Secret Key (leave empty for default):").grid(row=1, column=0, sticky="w")
+        self.secret_key_entry = tk.Entry(cred_frame, width=40, show="*")
+        self.secret_key_entry.grid(row=1, column=1, padx=5, pady=2)
+        
+        tk.Label(cred_frame, text="Region:").grid(row=2, column=0, sticky="w")
+        self.region_entry = tk.Entry(cred_frame, width=40)
+        self.region_entry.insert(0, "us-east-1")
+        self.region_entry.grid(row=2, column=1, padx=5, pady=2)
+        
+        tk.Button(cred_frame, text="Connect", command=self._connect_to_aws).grid(row=3, column=1, pady=5, sticky="e")
+        
+        # Buckets Frame
+        bucket_frame = tk.LabelFrame(self.window, text="S3 Buckets", padx=10, pady=10)
+        bucket_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        tk.Label(bucket_frame, text="Select Bucket (or enter manually below):").pack(anchor="w")
+        self.bucket_listbox = tk.Listbox(bucket_frame, height=5)
+        self.bucket_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.bucket_listbox.bind('<<ListboxSelect>>', self._on_bucket_select)
+        
+        # Manual bucket entry
+        manual_frame = tk.Frame(bucket_frame)
+        manual_frame.pack(fill=tk.X, pady=5)
+        tk.Label(manual_frame, text="Or enter bucket name:").pack(side="left", padx=5)
+        self.manual_bucket_entry = tk.Entry(manual_frame, width=30)
+        self.manual_bucket_entry.pack(side="left", padx=5)
+        tk.Button(manual_frame, text="Use This Bucket", command=self._use_manual_bucket).pack(side="left", padx=5)
+        
+        # Files Frame
+        files_frame = tk.LabelFrame(self.window, text="Files in Bucket", padx=10, pady=10)
+        files_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        tk.Label(files_frame, text="Select File:").pack(anchor="w")
+        self.files_listbox = tk.Listbox(files_frame, height=5)
+        self.files_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.files_listbox.bind('<<ListboxSelect>>', self._on_file_select)
+        
+        # Action Buttons
+        btn_frame = tk.Frame(self.window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        tk.Button(btn_frame, text="Import as Scenario", command=self._import_scenario, state="disabled").pack(side="left", padx=5)
+        self.import_btn = btn_frame.winfo_children()[0]
+        
+        tk.Button(btn_frame, text="Download to File", command=self._download_to_file, state="disabled").pack(side="left", padx=5)
+        self.download_btn = btn_frame.winfo_children()[1]
+        
+        tk.Button(btn_frame, text="Close", command=self.window.destroy).pack(side="right", padx=5)
+        
+        # Status
+        self.status_label = tk.Label(self.window, text="Status: Not connected", fg="gray")
+        self.status_label.pack(pady=5)
+    
+    def _connect_to_aws(self):
+        access_key = self.access_key_entry.get().strip() or None
+        secret_key = self.secret_key_entry.get().strip() or None
+        region = self.region_entry.get().strip() or "us-east-1"
+        
+        self.status_label.config(text="Status: Connecting...", fg="blue")
+        future = self._io_pool.submit(AWSS3Importer, access_key, secret_key, region)
+        future.add_done_callback(
+            lambda f: self.window.after(0, self._on_connected, f)
+        )
+    
+    def _on_connected(self, future):
+        try:
+            self.importer = future.result()
+            self.status_label.config(text="Status: Connected ✓", fg="green")
+            self._load_buckets()
+        except tk.TclError:
+            pass  # Window closed while connecting.
+        except Exception as e:
+            messagebox.showerror("Connection Error", f"Failed to connect to AWS:\n{str(e)}")
+            self.status_label.config(text="Status: Connection failed ✗", fg="red")
+    
+    def _load_buckets(self):
+        if not self.importer:
+            return
+        
+        future = self._io_pool.submit(self.importer.list_buckets)
+        future.add_done_callback(
+            lambda f: self.window.after(0, self._on_buckets_loaded, f)
+        )
+    
+    def _on_buckets_loaded(self, future):
+        try:
+            buckets = future.result()
+            self.bucket_listbox.delete(0, tk.END)
+            if buckets:
+                self.bucket_listbox.insert(tk.END, *buckets)
+            
+            if not buckets:
+                messagebox.showinfo(
+                    "No Buckets", 
+                    "No S3 buckets found.\n\nIf you know the bucket name, enter it manually below."
+                )
+        except Exception as e:
+            error_msg = str(e)
+            if "AccessDenied" in error_msg or "not authorized" in error_msg:
+                messagebox.showinfo(
+                    "Permission Required",
+                    "Your IAM user lacks 's3:ListAllMyBuckets' permission.\n\n"
+                    "You can still use S3 by entering the bucket name manually below."
+                )
+            else:
+                messagebox.showerror("Error", f"Failed to list buckets:\n{error_msg}")
+    
+    def _on_bucket_select(self, event):
+        selection = self.bucket_listbox.curselection()
+        if not selection:
+            return
+        
+        self.selected_bucket = self.bucket_listbox.get(selection[0])
+        self.manual_bucket_entry.delete(0, tk.END)
+        self.manual_bucket_entry.insert(0, self.selected_bucket)
+        self._load_files()
+    
+    def _use_manual_bucket(self):
+        bucket = self.manual_bucket_entry.get().strip()
+        if not bucket:
+            messagebox.showwarning("Bucket Required", "Please enter a bucket name.")
+            return
+        
+        self.selected_bucket = bucket
+        self.status_label.config(text=f"Using bucket: {bucket}", fg="blue")
+        self._load_files()
+    
+    def _load_files(self):
+        if not self.importer or not self.selected_bucket:
+            return
+        
+        self.status_label.config(text=f"Loading files from '{self.selected_bucket}'...", fg="blue")
+        
+        bucket = self.selected_bucket
+        future = self._io_pool.submit(
+            self.importer.list_objects, bucket, suffixes=AWSS3Importer.ACCEPTED_SUFFIXES
+        )
+        future.add_done_callback(
+            lambda f: self.window.after(0, self._on_files_loaded, f)
+        )
+    
+    def _on_files_loaded(self, future):
+        try:
+            csv_json = future.result()
+            self.files_listbox.delete(0, tk.END)
+            
+            # One varargs insert is a single Tcl call; inserting per item is
+            # O(N) bridge crossings and visibly janky past a few thousand keys.
+            if csv_json:
+                self.files_listbox.insert(tk.END, *csv_json)
+            
+            if not csv_json:
+                self.status_label.config(text=f"No CSV/JSON files in '{self.selected_bucket}'", fg="orange")
+                messagebox.showinfo("No Files", f"No CSV/JSON files found in bucket '{self.selected_bucket}'.")
+            else:
+                self.status_label.config(text=f"Loaded {len(csv_json)} file(s) from '{self.selected_bucket}'", fg="green")
+        except Exception as e:
+            self.status_label.config(text="Failed to list files", fg="red")
+            msg = str(e)
+            if "NoSuchBucket" in msg:
+                messagebox.showerror("Bucket Not Found", f"Bucket '{self.selected_bucket}' does not exist or is not accessible.")
+            elif "AccessDenied" in msg:
+                messagebox.showerror("Access Denied", f"Missing permission s3:ListBucket on '{self.selected_bucket}'.")
+            else:
+                messagebox.showerror("Error", f"Failed to list files:\n{msg}")
+    
+    def _on_file_select(self, event):
+        selection = self.files_listbox.curselection()
+        if not selection:
+            return
+        
+        self.selected_file = self.files_listbox.get(selection[0])
+        self.import_btn.config(state="normal")
+        self.download_btn.config(state="normal")
+        
+        # Start fetching now so the click on Import/Download mostly finds the
+        # content already in memory.
+        if self.importer and self.selected_bucket and self._prefetch_key != self.selected_file:
+            if self._prefetch_future is not None:
+                self._prefetch_future.cancel()
+            self._prefetch_key = self.selected_file
+            self._prefetch_future = self._io_pool.submit(
+                self.importer.download_csv_file, self.selected_bucket, self.selected_file
+            )
+    
+    def _take_prefetched_content(self) -> Optional[str]:
+        """Return the prefetched content for the current selection, if ready."""
+        if (self._prefetch_future is not None
+                and self._prefetch_key == self.selected_file
+                and self._prefetch_future.done()
+                and not self._prefetch_future.cancelled()):
+            try:
+                return self._prefetch_future.result()
+            except Exception as e:
+                logger.warning(f"Prefetch of '{self._prefetch_key}' failed: {e}")
+        return None
+    
+    def _import_scenario(self):
+        if not self.importer or not self.selected_bucket or not self.selected_file:
+            messagebox.showwarning("Selection Required", "Please select a bucket and file.")
+            return
+        
+        self.status_label.config(text=f"Downloading '{self.selected_file}'...", fg="blue")
+        self.window.update()
+        
+        content = self._take_prefetched_content()
+        if content is None:
+            content = self.importer.download_csv_file(self.selected_bucket, self.selected_file)
+        if content:
+            # Ask for file type/name to determine the save path
+            file_type = messagebox.askquestion(
+                "File Type",
+                "Is this a TEMPERATURE sensor file (like t1, t2, etc.)?\n\n"
+                "Click YES to save as dht_<name>.csv\n"
+                "Click NO to save as saved.csv (for scenarios)"
+            )
+            
+            if file_type == 'yes':
+                # Ask for the sensor name
+                from tkinter import simpledialog
+                sensor_name = simpledialog.askstring(
+                    "Sensor Name",
+                    "Enter sensor name (e.g., t1, t2, bedroom_temp):"
+                )
+                
+                if sensor_name:
+                    sensor_name = sensor_name.strip()
+                    local_path = os.path.join(str(ensure_devices_dir()), f"dht_{sensor_name}.csv")
+                else:
+                    messagebox.showwarning("Cancelled", "Import cancelled.")
+                    self.status_label.config(text="Import cancelled", fg="orange")
+                    return
+            else:
+                local_path = "saved.csv"
+            
+            if self.importer.save_to_local_csv(content, local_path):
+                messagebox.showinfo("Success", f"Imported '{self.selected_file}' to {local_path}\n\nUse File → Load default to open it.")
+                self.status_label.config(text="Import successful ✓", fg="green")
+                self.window.destroy()
+            else:
+                messagebox.showerror("Error", "Failed to save imported data.")
+                self.status_label.config(text="Import failed ✗", fg="red")
+        else:
+            messagebox.showerror("Error", "Failed to download file from S3.")
+            self.status_label.config(text="Download failed ✗", fg="red")
+    
+    def _download_to_file(self):
+        from tkinter import filedialog
+        
+        if not self.importer or not self.selected_bucket or not self.selected_file:
+            messagebox.showwarning("Selection Required", "Please select a bucket and file.")
+            return
+        
+        local_path = filedialog.asksaveasfilename(
+            title="Save As",
+            defaultextension=".csv",
+            initialfile=self.selected_file,
+            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        
+        if not local_path:
+            return
+        
+        self.status_label.config(text=f"Downloading '{self.selected_file}'...", fg="blue")
+        self.window.update()
+        
+        # Reuse the prefetched content when it is already in memory; otherwise
+        # stream straight to disk (the decode/re-encode round trip of
+        # download_csv_file+save_to_local_csv tripled peak memory on big files).
+        content = self._take_prefetched_content()
+        if content is not None:
+            ok = self.importer.save_to_local_csv(content, local_path)
+        else:
+            ok = self.importer.download_to_path(self.selected_bucket, self.selected_file, local_path)
+        if ok:
+            messagebox.showinfo("Success", f"Downloaded to:\n{local_path}")
+            self.status_label.config(text="Download successful ✓", fg="green")
+        else:
+            messagebox.showerror("Error", "Failed to download file.")
+            self.status_label.config(text="Download failed ✗", fg="red")
+
+
+def open_aws_import_ui(parent: tk.Tk):
+    """Open the AWS S3 import dialog."""
+    AWSS3ImportUI(parent)
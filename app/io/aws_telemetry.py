@@ -1,713 +1,1161 @@
-"""
-AWS S3 telemetry data importer for DHT22 and Smart Meter logs.
-Imports time-series JSON data from S3 and applies it to bound sensors/devices.
-"""
-from __future__ import annotations
-
-import json
-import csv
-import io
-import os
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from tkinter import messagebox
-import tkinter as tk
-from tkinter import ttk, scrolledtext
-
-try:
-    import boto3
-    from botocore.exceptions import ClientError, NoCredentialsError
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
-
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-
-from app.logging_setup import setup_logging
-from app.save_paths import ensure_devices_dir
-
-logger = setup_logging("io.aws_telemetry")
-
-
-def _sanitize_name(name: str) -> str:
-    return "".join(ch if ch.isalnum() or ch in "-_." else "-" for ch in (name or "").strip())
-
-
-class AWSTelemetryImporter:
-    """Import telemetry data (DHT22, Smart Meter) from AWS S3."""
-    
-    def __init__(self, aws_access_key: Optional[str] = None, 
-                 aws_secret_key: Optional[str] = None,
-                 region_name: str = 'eu-central-1'):
-        if not BOTO3_AVAILABLE:
-            raise ImportError("boto3 not installed. Run: pip install boto3")
-        
-        try:
-            if aws_access_key and aws_secret_key:
-                self.s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=aws_access_key,
-                    aws_secret_access_key=aws_secret_key,
-                    region_name=region_name
-                )
-            else:
-                self.s3_client = boto3.client('s3', region_name=region_name)
-            
-            logger.info("AWS S3 client initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize AWS S3: {e}")
-            raise
-    
-    def list_buckets(self) -> List[str]:
-        try:
-            response = self.s3_client.list_buckets()
-            return [b['Name'] for b in response.get('Buckets', [])]
-        except Exception as e:
-            logger.error(f"Error listing buckets: {e}")
-            return []
-    
-    def list_objects(self, bucket: str, prefix: str = '') -> List[Dict[str, Any]]:
-        """List objects with metadata (Key, Size, LastModified)."""
-        try:
-            response = self.s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-            return response.get('Contents', [])
-        except Exception as e:
-            logger.error(f"Error listing objects: {e}")
-            return []
-    
-    def download_file(self, bucket: str, key: str) -> Optional[str]:
-        """Download file as string."""
-        try:
-            obj = self.s3_client.get_object(Bucket=bucket, Key=key)
-            content = obj['Body'].read().decode('utf-8')
-            logger.info(f"Downloaded {key} from {bucket} ({len(content)} bytes)")
-            return content
-        except Exception as e:
-            logger.error(f"Error downloading {key}: {e}")
-            return None
-    
-    def detect_data_type(self, content: str) -> Optional[str]:
-        """Detect if content is DHT or SmartMeter JSON by examining first valid JSON line."""
-        for line in content.split('\n'):
-            if not line.strip():
-                continue
-            try:
-                data = json.loads(line)
-                # Check for SmartMeter fields (check first for priority)
-                if 'apower' in data or 'power_w' in data or 'power' in data:
-                    logger.info(f"Detected SmartMeter data: {list(data.keys())}")
-                    return 'smartmeter'
-                if 'voltage' in data or 'voltage_v' in data:
-                    logger.info(f"Detected SmartMeter data (voltage): {list(data.keys())}")
-                    return 'smartmeter'
-                if 'current' in data or 'current_a' in data:
-                    logger.info(f"Detected SmartMeter data (current): {list(data.keys())}")
-                    return 'smartmeter'
-                if 'ts' in data and ('energy_total' in data or 'energy' in data):
-                    logger.info(f"Detected SmartMeter data (ts+energy): {list(data.keys())}")
-                    return 'smartmeter'
-                # Check for DHT fields
-                if 'temperature_c' in data or 'humidity_rh' in data or 'label' in data:
-                    logger.info(f"Detected DHT data: {list(data.keys())}")
-                    return 'dht'
-            except Exception as e:
-                logger.warning(f"Failed to parse JSON line: {e}")
-                continue
-        logger.warning(f"Could not detect data type from content (first 200 chars): {content[:200]}")
-        return None
-    
-    def parse_dht_data(self, content: str) -> List[Dict[str, Any]]:
-        """
-        Parse DHT22 data from JSON lines format.
-        Expected: {"timestamp_iso": 1765481925, "label": "t1", "gpio": 4, "temperature_c": 16.4, "humidity_rh": 74.6}
-        """
-        records = []
-        for line in content.strip().split('\n'):
-            if not line.strip():
-                continue
-            try:
-                data = json.loads(line)
-                records.append({
-                    'timestamp': data.get('timestamp_iso'),
-                    'label': data.get('label'),
-                    'gpio': data.get('gpio'),
-                    'temperature': data.get('temperature_c'),
-                    'humidity': data.get('humidity_rh')
-                })
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid JSON line: {line[:50]}... - {e}")
-        return records
-    
-    def parse_smartmeter_data(self, content: str) -> List[Dict[str, Any]]:
-        """
-        Parse Smart Meter data from JSON lines.
-        Expected: {"ts":1765405428638,"apower":37.5,"voltage":229.7,"current":0.291,"energy_total":134.083}
-        """
-        records = []
-        for line in content.strip().split('\n'):
-            if not line.strip():
-                continue
-            try:
-                data = json.loads(line)
-                records.append({
-                    'timestamp': data.get('ts'),
-                    'power': data.get('apower'),
-                    'voltage': data.get('voltage'),
-                    'current': data.get('current'),
-                    'energy': data.get('energy_total')
-                })
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid JSON line: {line[:50]}... - {e}")
-        return records
-    
-    def save_dht_to_csv(self, records: List[Dict], filepath: str) -> bool:
-        """Save DHT records to CSV in dhtlogger format."""
-        try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp_iso', 'label', 'gpio', 'temp_C', 'hum_%'])
-                for r in records:
-                    writer.writerow([
-                        r.get('timestamp', ''),
-                        r.get('label', ''),
-                        r.get('gpio', ''),
-                        r.get('temperature', ''),
-                        r.get('humidity', '')
-                    ])
-            logger.info(f"Saved {len(records)} DHT records to {filepath}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save DHT CSV: {e}")
-            return False
-    
-    def save_smartmeter_to_csv(self, records: List[Dict], filepath: str, device_name: str = "device") -> bool:
-        """Save Smart Meter records to CSV in smartmeter format."""
-        try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp_iso', 'device', 'device_id', 'ip', 'power_W', 'voltage_V', 'current_A'])
-                for r in records:
-                    writer.writerow([
-                        r.get('timestamp', ''),
-                        device_name,
-                        device_name,
-                        'imported',
-                        r.get('power', ''),
-                        r.get('voltage', ''),
-                        r.get('current', '')
-                    ])
-            logger.info(f"Saved {len(records)} Smart Meter records to {filepath}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save Smart Meter CSV: {e}")
-            return False
-
-
-class AWSTelemetryImportUI:
-    """UI for importing telemetry data from AWS S3."""
-    
-    def __init__(self, parent: tk.Tk):
-        self.parent = parent
-        self.window = tk.Toplevel(parent)
-        self.window.title("Import Telemetry from AWS S3")
-        self.window.geometry("750x650")
-        
-        self.importer: Optional[AWSTelemetryImporter] = None
-        self.selected_bucket = None
-        self.selected_files = []
-        
-        self._build_ui()
-    
-    def _build_ui(self):
-        if not BOTO3_AVAILABLE:
-            tk.Label(
-                self.window,
-                text="❌ boto3 not installed\n\nInstall with:\npip install boto3",
-                fg="red",
-                font=("Arial", 12),
-                justify="center"
-            ).pack(pady=30)
-            tk.Button(self.window, text="Close", command=self.window.destroy).pack()
-            return
-        
-        # Credentials
-        cred_frame = tk.LabelFrame(self.window, text="AWS Credentials", padx=10, pady=10)
-        cred_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        tk.Label(cred_frame, text="Access Key (optional):").grid(row=0, column=0, sticky="w", padx=5)
-        self.access_key_entry = tk.Entry(cred_frame, width=35, show="*")
-        self.access_key_entry.grid(row=0, column=1, padx=5, pady=2)
-        
-        tk.Label(cred_frame, text="Secret Key (optional):").grid(row=1, column=0, sticky="w", padx=5)
-        self.secret_key_entry = tk.Entry(cred_frame, width=35, show="*")
-        self.secret_key_entry.grid(row=1, column=1, padx=5, pady=2)
-        
-        tk.Label(cred_frame, text="Region:").grid(row=2, column=0, sticky="w", padx=5)
-        self.region_entry = tk.Entry(cred_frame, width=35)
-        self.region_entry.insert(0, "us-east-1")
-        self.region_entry.grid(row=2, column=1, padx=5, pady=2)
-        
-        tk.Button(cred_frame, text="Connect", command=self._connect).grid(row=3, column=1, pady=5, sticky="e")
-        
-        # Buckets
-        bucket_frame = tk.LabelFrame(self.window, text="S3 Buckets", padx=10, pady=10)
-        bucket_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        tk.Label(bucket_frame, text="Select bucket (or enter manually):").pack(anchor="w")
-        self.bucket_listbox = tk.Listbox(bucket_frame, height=4)
-        self.bucket_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.bucket_listbox.bind('<<ListboxSelect>>', self._on_bucket_select)
-
-        manual_bucket = tk.Frame(bucket_frame)
-        manual_bucket.pack(fill=tk.X, pady=4)
-        tk.Label(manual_bucket, text="Bucket name:").pack(side="left", padx=5)
-        self.manual_bucket_entry = tk.Entry(manual_bucket, width=30)
-        self.manual_bucket_entry.pack(side="left", padx=5)
-        tk.Button(manual_bucket, text="Use", command=self._use_manual_bucket).pack(side="left", padx=5)
-        
-        # Files
-        files_frame = tk.LabelFrame(self.window, text="Files (select DHT or Smart Meter logs)", padx=10, pady=10)
-        files_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        tk.Label(files_frame, text="Select files:").pack(anchor="w")
-        self.files_listbox = tk.Listbox(files_frame, height=6, selectmode=tk.MULTIPLE)
-        self.files_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # Data Type
-        type_frame = tk.Frame(self.window)
-        type_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        tk.Label(type_frame, text="Data Type:").pack(side="left", padx=5)
-        self.data_type_var = tk.StringVar(value="smartmeter")
-        tk.Radiobutton(type_frame, text="DHT22 (Temperature/Humidity)", variable=self.data_type_var, value="dht", command=self._on_data_type_change).pack(side="left", padx=10)
-        tk.Radiobutton(type_frame, text="Smart Meter (Power)", variable=self.data_type_var, value="smartmeter", command=self._on_data_type_change).pack(side="left", padx=10)
-        tk.Radiobutton(type_frame, text="All JSON files", variable=self.data_type_var, value="all", command=self._on_data_type_change).pack(side="left", padx=10)
-        
-        # Actions
-        btn_frame = tk.Frame(self.window)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        self.import_btn = tk.Button(btn_frame, text="Import to devices/", command=self._import_data, state="disabled")
-        self.import_btn.pack(side="left", padx=5)
-        
-        self.import_all_btn = tk.Button(btn_frame, text="Import ALL to one CSV", command=self._import_all, state="disabled")
-        self.import_all_btn.pack(side="left", padx=5)
-
-        self.combine_json_btn = tk.Button(btn_frame, text="Combine ALL to one JSON", command=self._combine_all_json, state="disabled")
-        self.combine_json_btn.pack(side="left", padx=5)
-        
-        self.preview_btn = tk.Button(btn_frame, text="Preview Data", command=self._preview_data, state="disabled")
-        self.preview_btn.pack(side="left", padx=5)
-        
-        tk.Button(btn_frame, text="Close", command=self.window.destroy).pack(side="right", padx=5)
-        
-        # Status
-        self.status_label = tk.Label(self.window, text="Status: Not connected", fg="gray", font=("Arial", 9))
-        self.status_label.pack(pady=5)
-    
-    def _connect(self):
-        access_key = self.access_key_entry.get().strip() or None
-        secret_key = self.secret_key_entry.get().strip() or None
-        region = self.region_entry.get().strip() or "us-east-1"
-        
-        try:
-            self.importer = AWSTelemetryImporter(access_key, secret_key, region)
-            self.status_label.config(text="✓ Connected to AWS", fg="green")
-            self._load_buckets()
-        except Exception as e:
-            messagebox.showerror("Connection Error", f"Failed to connect:\n{str(e)}")
-            self.status_label.config(text="✗ Connection failed", fg="red")
-    
-    def _load_buckets(self):
-        if not self.importer:
-            return
-        
-        try:
-            buckets = self.importer.list_buckets()
-            self.bucket_listbox.delete(0, tk.END)
-            for bucket in buckets:
-                self.bucket_listbox.insert(tk.END, bucket)
-            
-            if not buckets:
-                messagebox.showinfo(
-                    "No Buckets",
-                    "No S3 buckets found. If you know the bucket name, enter it manually."
-                )
-        except Exception as e:
-            msg = str(e)
-            if "AccessDenied" in msg or "not authorized" in msg:
-                messagebox.showinfo(
-                    "Permission Required",
-                    "Your IAM user lacks 's3:ListAllMyBuckets'. Enter the bucket name manually."
-                )
-            else:
-                messagebox.showerror("Error", f"Failed to list buckets:\n{msg}")
-    
-    def _on_bucket_select(self, event):
-        sel = self.bucket_listbox.curselection()
-        if not sel:
-            return
-        
-        self.selected_bucket = self.bucket_listbox.get(sel[0])
-        self.manual_bucket_entry.delete(0, tk.END)
-        self.manual_bucket_entry.insert(0, self.selected_bucket)
-        self._load_files()
-
-    def _use_manual_bucket(self):
-        bucket = (self.manual_bucket_entry.get() or "").strip()
-        if not bucket:
-            messagebox.showwarning("Bucket Required", "Please enter a bucket name.")
-            return
-        self.selected_bucket = bucket
-        self.status_label.config(text=f"Using bucket: {bucket}", fg="blue")
-        self._load_files()
-    
-    def _on_data_type_change(self):
-        """Reload files when data type selection changes."""
-        self._load_files()
-    
-    def _load_files(self):
-        if not self.importer or not self.selected_bucket:
-            return
-        
-        self.status_label.config(text=f"Loading files from '{self.selected_bucket}'...", fg="blue")
-        self.window.update()
-        try:
-            objects = self.importer.list_objects(self.selected_bucket)
-            logger.info(f"Found {len(objects)} total objects in bucket")
-            self.files_listbox.delete(0, tk.END)
-            
-            data_type = self.data_type_var.get()
-            filtered = []
-            json_count = 0
-            
-            for obj in objects:
-                key = obj.get('Key', '')
-                # Only check files with JSON-like extensions
-                if not key.endswith(('.json', '.csv', '.log', '.txt')):
-                    logger.debug(f"Skipping {key} (unsupported extension)")
-                    continue
-                
-                if key.endswith('.json'):
-                    json_count += 1
-                
-                logger.info(f"Checking file: {key}")
-                # Download and detect data type
-                content = self.importer.download_file(self.selected_bucket, key)
-                if not content:
-                    logger.warning(f"Empty or failed download: {key}")
-                    continue
-                
-                logger.info(f"Downloaded {len(content)} bytes from {key}")
-                detected_type = self.importer.detect_data_type(content)
-                logger.info(f"File {key} detected as: {detected_type} (looking for: {data_type})")
-                
-                # Only include files matching selected data type (or all if data_type == 'all')
-                if data_type == 'all' or detected_type == data_type:
-                    filtered.append(key)
-                    display_text = f"{key} [{detected_type or 'unknown'}]" if data_type == 'all' else key
-                    self.files_listbox.insert(tk.END, display_text)
-            
-            logger.info(f"Found {json_count} JSON files, {len(filtered)} matched {data_type} type")
-            
-            if not filtered:
-                msg = "No DHT22 files found" if data_type == "dht" else ("No Smart Meter files found" if data_type == "smartmeter" else "No JSON files found")
-                self.status_label.config(text=msg, fg="orange")
-                messagebox.showinfo("No Files", f"{msg} in bucket '{self.selected_bucket}'.")
-            else:
-                self.status_label.config(text=f"✓ Loaded {len(filtered)} file(s)", fg="green")
-                self.import_btn.config(state="normal")
-                self.preview_btn.config(state="normal")
-                self.combine_json_btn.config(state="normal")
-                self.import_all_btn.config(state="normal")
-        except Exception as e:
-            self.status_label.config(text="✗ Failed to list files", fg="red")
-            msg = str(e)
-            if "NoSuchBucket" in msg:
-                messagebox.showerror("Bucket Not Found", f"Bucket '{self.selected_bucket}' not found or not accessible.")
-            elif "AccessDenied" in msg:
-                messagebox.showerror("Access Denied", f"Missing permission s3:ListBucket on '{self.selected_bucket}'.")
-            else:
-                messagebox.showerror("Error", f"Failed to list files:\n{msg}")
-    
-    def _import_data(self):
-        sel = self.files_listbox.curselection()
-        if not sel:
-            messagebox.showwarning("No Selection", "Please select at least one file.")
-            return
-        
-        files = [self.files_listbox.get(i) for i in sel]
-        data_type = self.data_type_var.get()
-        
-        # Ask for output base name
-        default_name = "dht_import" if data_type == "dht" else "smartmeter_import"
-        output_name = tk.simpledialog.askstring(
-            "Output CSV name",
-            "Enter the name for the new CSV (without .csv):",
-            parent=self.window,
-            initialvalue=default_name
-        )
-        if not output_name:
-            return
-        
-        original_name = output_name
-        output_name = _sanitize_name(output_name)
-        
-        # Add prefix if not already present
-        if data_type == "dht" and not output_name.startswith("dht_"):
-            output_name = f"dht_{output_name}"
-        elif data_type == "smartmeter" and not output_name.startswith("smartmeter_"):
-            output_name = f"smartmeter_{output_name}"
-        
-        print(f"DEBUG: original='{original_name}', sanitized='{_sanitize_name(original_name)}', data_type='{data_type}', final='{output_name}'")
-        
-        logs_dir = str(ensure_devices_dir())
-        
-        self.status_label.config(text=f"Importing {len(files)} file(s)...", fg="blue")
-        self.window.update()
-        
-        combined_records = []
-        for file_key in files:
-            content = self.importer.download_file(self.selected_bucket, file_key)
-            if not content:
-                continue
-            
-            if data_type == "dht":
-                combined_records.extend(self.importer.parse_dht_data(content))
-            elif data_type == "smartmeter":
-                combined_records.extend(self.importer.parse_smartmeter_data(content))
-        
-        if not combined_records:
-            self.status_label.config(text="✗ Import failed", fg="red")
-            messagebox.showerror("Import Failed", "No data could be imported.")
-            return
-        
-        if data_type == "dht":
-            dest = os.path.join(logs_dir, f"{output_name}.csv")
-            ok = self.importer.save_dht_to_csv(combined_records, dest)
-        else:
-            dest = os.path.join(logs_dir, f"{output_name}.csv")
-            ok = self.importer.save_smartmeter_to_csv(combined_records, dest, device_name=output_name)
-        
-        if ok:
-            self.status_label.config(text=f"✓ Imported to {dest}", fg="green")
-            messagebox.showinfo(
-                "Import Complete",
-                f"Saved {len(combined_records)} rows to:\n{dest}\n\n"
-                f"Use 'Generate graphs' in Simulation menu to visualize."
-            )
-        else:
-            self.status_label.config(text="✗ Import failed", fg="red")
-            messagebox.showerror("Import Failed", "Unable to save CSV.")
-
-    def _import_all(self):
-        if not self.selected_bucket:
-            messagebox.showwarning("No Bucket", "Please select or enter a bucket first.")
-            return
-
-        data_type = self.data_type_var.get()
-        
-        # Determine default name and actual processing type
-        if data_type == 'all':
-            default_name = "combined_all"
-            process_as = 'smartmeter'  # Default to smartmeter for 'all' mode
-        else:
-            default_name = "dht_all" if data_type == "dht" else "smartmeter_all"
-            process_as = data_type
-            
-        output_name = tk.simpledialog.askstring(
-            "Output CSV name",
-            "Enter the name for the combined CSV (without .csv):",
-            parent=self.window,
-            initialvalue=default_name
-        )
-        if not output_name:
-            return
-        output_name = _sanitize_name(output_name)
-        
-        # Add prefix if not already present
-        if process_as == "dht" and not output_name.startswith("dht_"):
-            output_name = f"dht_{output_name}"
-        elif process_as == "smartmeter" and not output_name.startswith("smartmeter_"):
-            output_name = f"smartmeter_{output_name}"
-        
-        logs_dir = str(ensure_devices_dir())
-
-        self.status_label.config(text=f"Importing ALL files from '{self.selected_bucket}'...", fg="blue")
-        self.window.update()
-
-        try:
-            objects = self.importer.list_objects(self.selected_bucket)
-        except Exception as e:
-            self.status_label.config(text="✗ Import failed", fg="red")
-            messagebox.showerror("Error", f"Cannot list objects:\n{e}")
-            return
-
-        # Filter by file type, then by content type
-        target_keys = []
-        for obj in objects:
-            key = obj.get('Key', '')
-            if not key.endswith(('.json', '.txt', '.log', '.csv')):
-                continue
-            
-            content = self.importer.download_file(self.selected_bucket, key)
-            if not content:
-                continue
-            
-            detected_type = self.importer.detect_data_type(content)
-            # Include file if data_type is 'all' or matches detected type
-            if data_type == 'all' or detected_type == data_type:
-                target_keys.append((key, detected_type or process_as))
-        
-        if not target_keys:
-            self.status_label.config(text="No matching files found", fg="orange")
-            msg = "No DHT22 files found" if data_type == "dht" else ("No Smart Meter files found" if data_type == "smartmeter" else "No JSON files found")
-            messagebox.showinfo("No Files", f"{msg} in this bucket.")
-            return
-
-        combined_records = []
-        for key, file_type in target_keys:
-            content = self.importer.download_file(self.selected_bucket, key)
-            if not content:
-                continue
-            # Use detected file type or fallback to process_as
-            if file_type == "dht":
-                combined_records.extend(self.importer.parse_dht_data(content))
-            else:
-                combined_records.extend(self.importer.parse_smartmeter_data(content))
-
-        if not combined_records:
-            self.status_label.config(text="✗ Import failed", fg="red")
-            messagebox.showerror("Import Failed", "No data could be imported from the bucket.")
-            return
-
-        dest = os.path.join(logs_dir, f"{output_name}.csv")
-        # Save based on process_as type
-        if process_as == "dht":
-            ok = self.importer.save_dht_to_csv(combined_records, dest)
-        else:
-            ok = self.importer.save_smartmeter_to_csv(combined_records, dest, device_name=output_name)
-
-        if ok:
-            self.status_label.config(text=f"✓ Imported {len(combined_records)} rows from {len(target_keys)} files", fg="green")
-            messagebox.showinfo(
-                "Import Complete",
-                f"Saved {len(combined_records)} rows from {len(target_keys)} files to:\n{dest}\n\n"
-                f"Use 'Generate graphs' to visualize."
-            )
-        else:
-            self.status_label.config(text="✗ Import failed", fg="red")
-            messagebox.showerror("Import Failed", "Unable to save CSV.")
-
-    def _combine_all_json(self):
-        if not self.selected_bucket:
-            messagebox.showwarning("No Bucket", "Please select or enter a bucket first.")
-            return
-
-        data_type = self.data_type_var.get()
-        default_name = "dht_all" if data_type == "dht" else "smartmeter_all"
-        output_name = tk.simpledialog.askstring(
-            "Output JSON name",
-            "Enter the name for the combined JSON (without .json):",
-            parent=self.window,
-            initialvalue=default_name
-        )
-        if not output_name:
-            return
-        output_name = _sanitize_name(output_name)
-        logs_dir = str(ensure_devices_dir())
-
-        self.status_label.config(text=f"Combining ALL JSON from '{self.selected_bucket}'...", fg="blue")
-        self.window.update()
-
-        try:
-            objects = self.importer.list_objects(self.selected_bucket)
-        except Exception as e:
-            self.status_label.config(text="✗ Combine failed", fg="red")
-            messagebox.showerror("Error", f"Cannot list objects:\n{e}")
-            return
-
-        # Filter by file type, then by content type
-        target_keys = []
-        for obj in objects:
-            key = obj.get('Key', '')
-            if not key.endswith(('.json', '.txt', '.log', '.csv')):
-                continue
-            
-            content = self.importer.download_file(self.selected_bucket, key)
-            if not content:
-                continue
-            
-            detected_type = self.importer.detect_data_type(content)
-            if detected_type == data_type:
-                target_keys.append((key, content))
-        
-        if not target_keys:
-            self.status_label.config(text="No matching files found", fg="orange")
-            msg = "No DHT22 files found" if data_type == "dht" else "No Smart Meter files found"
-            messagebox.showinfo("No Files", f"{msg} in this bucket.")
-            return
-
-        combined_lines = []
-        for key, content in target_keys:
-            # keep as raw lines (newline-delimited JSON)
-            combined_lines.extend([ln for ln in content.split('\n') if ln.strip()])
-
-        if not combined_lines:
-            self.status_label.config(text="✗ Combine failed", fg="red")
-            messagebox.showerror("Combine Failed", "No data could be combined from the bucket.")
-            return
-
-        dest = os.path.join(logs_dir, f"{output_name}.json")
-        try:
-            with open(dest, 'w', encoding='utf-8') as f:
-                f.write("\n".join(combined_lines))
-            self.status_label.config(text=f"✓ Combined {len(combined_lines)} lines from {len(target_keys)} files", fg="green")
-            messagebox.showinfo(
-                "Combine Complete",
-                f"Saved {len(combined_lines)} JSON lines from {len(target_keys)} files to:\n{dest}"
-            )
-        except Exception as e:
-            self.status_label.config(text="✗ Combine failed", fg="red")
-            messagebox.showerror("Combine Failed", f"Unable to save JSON file:\n{e}")
-    
-    def _preview_data(self):
-        sel = self.files_listbox.curselection()
-        if not sel:
-            messagebox.showwarning("No Selection", "Select a file to preview.")
-            return
-        
-        file_key = self.files_listbox.get(sel[0])
-        content = self.importer.download_file(self.selected_bucket, file_key)
-        
-        if not content:
-            messagebox.showerror("Error", "Failed to download file.")
-            return
-        
-        # Preview window
-        prev = tk.Toplevel(self.window)
-        prev.title(f"Preview: {file_key}")
-        prev.geometry("700x500")
-        
-        tk.Label(prev, text=f"File: {file_key}", font=("Arial", 10, "bold")).pack(pady=5)
-        
-        text = scrolledtext.ScrolledText(prev, wrap=tk.WORD, width=80, height=25)
-        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Show first 100 lines
-        lines = content.split('\n')[:100]
-        text.insert(tk.END, '\n'.join(lines))
-        if len(content.split('\n')) > 100:
-            text.insert(tk.END, f"\n\n... (showing first 100 lines of {len(content.split(chr(10)))})")
-        text.config(state=tk.DISABLED)
-        
-        tk.Button(prev, text="Close", command=prev.destroy).pack(pady=10)
-
-
-def open_aws_telemetry_ui(parent: tk.Tk):
-    """Open AWS telemetry import dialog."""
-    AWSTelemetryImportUI(parent)
+"""
+AWS S3 telemetry data importer for DHT22 and Smart Meter logs.
+Imports time-series JSON data from S3 and applies it to bound sensors/devices.
+"""
+from __future__ import annotations
+
+import json
+import csv
+import io
+import logging
+import re
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from datetime import datetime
+from tkinter import messagebox
+import tkinter as tk
+from tkinter import scrolledtext
+
+# boto3 and pandas are imported on first use: eagerly importing them costs
+# ~200 ms (boto3) and ~150 ms + ~80 MB RSS (pandas) at every app launch,
+# even when this dialog is never opened. Same lazy scheme as aws_diagnostic.
+boto3 = None
+Config = None
+BOTO3_AVAILABLE: Optional[bool] = None
+ClientError = NoCredentialsError = Exception
+
+pd = None
+PANDAS_AVAILABLE: Optional[bool] = None
+
+
+def _ensure_boto3() -> bool:
+    """Import boto3/botocore on first use; safe to call repeatedly."""
+    global boto3, Config, BOTO3_AVAILABLE, ClientError, NoCredentialsError
+    if BOTO3_AVAILABLE is None:
+        try:
+            import boto3 as _boto3
+            from botocore.config import Config as _Config
+            from botocore.exceptions import ClientError as _ClientError
+            from botocore.exceptions import NoCredentialsError as _NoCredentialsError
+            boto3 = _boto3
+            Config = _Config
+            ClientError = _ClientError
+            NoCredentialsError = _NoCredentialsError
+            BOTO3_AVAILABLE = True
+        except ImportError:
+            BOTO3_AVAILABLE = False
+    return BOTO3_AVAILABLE
+
+
+def _ensure_pandas() -> bool:
+    """Import pandas on first use; safe to call repeatedly."""
+    global pd, PANDAS_AVAILABLE
+    if PANDAS_AVAILABLE is None:
+        try:
+            import pandas as _pd
+            pd = _pd
+            PANDAS_AVAILABLE = True
+        except ImportError:
+            PANDAS_AVAILABLE = False
+    return PANDAS_AVAILABLE
+
+try:
+    import orjson
+    _json_loads = orjson.loads  # ~3-5x faster than stdlib on small objects
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    # The C backend parses incrementally at yajl speed; plain ijson is the
+    # pure-Python fallback shipped by the same package.
+    try:
+        from ijson.backends import yajl2_c as ijson
+    except ImportError:
+        import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+from app.logging_setup import setup_logging
+from app.save_paths import ensure_devices_dir
+
+logger = setup_logging("io.aws_telemetry")
+
+# Payload size above which the parsers hand NDJSON to pandas; below it the
+# DataFrame construction overhead outweighs the C-parser win.
+_PANDAS_MIN_BYTES = 1 << 20
+
+# Bytes fetched by the ranged classification probe: enough for the first few
+# NDJSON records, orders of magnitude less than downloading the file.
+_PROBE_BYTES = 4096
+
+# Bytes fetched for the preview window — comfortably more than 100 lines of
+# telemetry, regardless of how big the object is.
+_PREVIEW_BYTES = 131072
+
+
+def _iter_lines(source) -> Iterator[str]:
+    """Yield text lines from either a str or a botocore StreamingBody.
+
+    The streaming branch reads 64 KiB chunks, so peak memory stays at one
+    chunk instead of the whole (possibly larger-than-RAM) object.
+    """
+    if isinstance(source, str):
+        yield from source.splitlines()
+    else:
+        for raw in source.iter_lines(chunk_size=65536):
+            yield raw.decode('utf-8', errors='replace')
+
+
+# Extensions the importer considers at all; shared by every candidate scan.
+_ACCEPTED_EXTS = ('.json', '.csv', '.log', '.txt')
+
+# Filename substrings that make a content probe unnecessary. Checked against
+# the lowercased key; first matching group wins.
+_KEY_HINTS = (
+    ('smartmeter', ('smartmeter', 'smart_meter', 'shelly', 'power')),
+    ('dht', ('dht', 'temp', 'humid')),
+)
+
+
+def _classify_by_key(key: str) -> Optional[str]:
+    """Guess the telemetry type from the object key alone, or None."""
+    lowered = key.lower()
+    for kind, hints in _KEY_HINTS:
+        for hint in hints:
+            if hint in lowered:
+                return kind
+    return None
+
+
+# Key sets identifying each schema. frozenset.isdisjoint short-circuits in
+# C, so one call replaces a whole chain of per-key membership tests.
+_SMART_KEYS = frozenset({'apower', 'power_w', 'power', 'voltage', 'voltage_v',
+                         'current', 'current_a'})
+_SMART_ENERGY_KEYS = frozenset({'energy_total', 'energy'})
+_DHT_KEYS = frozenset({'temperature_c', 'humidity_rh', 'label'})
+
+# Field order of the record tuples produced by the parsers. itemgetter
+# extracts all five values in one C call instead of five dict.get calls —
+# the dominant per-line cost in the pure-Python parse path.
+_DHT_FIELDS = ('timestamp_iso', 'label', 'gpio', 'temperature_c', 'humidity_rh')
+_SM_FIELDS = ('ts', 'apower', 'voltage', 'current', 'energy_total')
+_DHT_GET = itemgetter(*_DHT_FIELDS)
+_SM_GET = itemgetter(*_SM_FIELDS)
+
+
+def _map_dht(data: Dict[str, Any]) -> tuple:
+    """(timestamp, label, gpio, temperature, humidity)"""
+    try:
+        return _DHT_GET(data)
+    except KeyError:
+        return tuple(data.get(k) for k in _DHT_FIELDS)
+
+
+def _map_smartmeter(data: Dict[str, Any]) -> tuple:
+    """(timestamp, power, voltage, current, energy)"""
+    try:
+        return _SM_GET(data)
+    except KeyError:
+        return tuple(data.get(k) for k in _SM_FIELDS)
+
+
+_RECORD_MAPPERS = {'dht': _map_dht, 'smartmeter': _map_smartmeter}
+
+
+def _open_csv_buffered(filepath: str) -> io.TextIOWrapper:
+    """Open a CSV target with a 1 MiB user-space buffer.
+
+    An unbuffered binary file under an explicit BufferedWriter means the
+    kernel sees ~1 MiB write(2) calls instead of the text layer's default
+    8 KiB flushes — the difference is pronounced on network filesystems.
+    """
+    raw = open(filepath, 'wb', buffering=0)
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=1 << 20),
+                            encoding='utf-8', newline='')
+
+
+# Anything outside the filename-safe set collapses to '-'.
+_SANITIZE_RE = re.compile(r'[^0-9A-Za-z._-]')
+
+
+def _sanitize_name(name: str) -> str:
+    return _SANITIZE_RE.sub('-', (name or "").strip())
+
+
+class AWSTelemetryImporter:
+    """Import telemetry data (DHT22, Smart Meter) from AWS S3."""
+    
+    def __init__(self, aws_access_key: Optional[str] = None, 
+                 aws_secret_key: Optional[str] = None,
+                 region_name: str = 'eu-central-1'):
+        if not _ensure_boto3():
+            raise ImportError("boto3 not installed. Run: pip install boto3")
+        
+        # A 32-connection pool lets download_many actually run in parallel
+        # (the default pool of 10 serializes anything beyond that); adaptive
+        # retries back off sensibly on transient throttling.
+        client_config = Config(
+            max_pool_connections=32,
+            retries={'mode': 'adaptive'},
+        )
+
+        try:
+            if aws_access_key and aws_secret_key:
+                self.s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=aws_access_key,
+                    aws_secret_access_key=aws_secret_key,
+                    region_name=region_name,
+                    config=client_config
+                )
+            else:
+                self.s3_client = boto3.client('s3', region_name=region_name,
+                                              config=client_config)
+            
+            logger.info("AWS S3 client initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize AWS S3: {e}")
+            raise
+    
+    def list_buckets(self) -> List[str]:
+        try:
+            response = self.s3_client.list_buckets()
+            return [b['Name'] for b in response.get('Buckets', [])]
+        except Exception as e:
+            logger.error(f"Error listing buckets: {e}")
+            return []
+    
+    def list_objects(self, bucket: str, prefix: str = '') -> List[Dict[str, Any]]:
+        """List **all** objects with metadata (Key, Size, LastModified).
+
+        Uses the list_objects_v2 paginator: a single call is capped at 1000
+        keys, which silently truncated larger buckets. A server-side Prefix
+        narrows the listing before anything crosses the network.
+        """
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            objects: List[Dict[str, Any]] = []
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                objects.extend(page.get('Contents', []))
+            return objects
+        except Exception as e:
+            logger.error(f"Error listing objects: {e}")
+            return []
+    
+    def download_file(self, bucket: str, key: str) -> Optional[str]:
+        """Download file as string."""
+        try:
+            obj = self.s3_client.get_object(Bucket=bucket, Key=key)
+            content = obj['Body'].read().decode('utf-8')
+            logger.debug("Downloaded %s from %s (%d bytes)", key, bucket, len(content))
+            return content
+        except Exception as e:
+            logger.error(f"Error downloading {key}: {e}")
+            return None
+    
+    def download_stream(self, bucket: str, key: str):
+        """Return the object's StreamingBody without reading it, or None.
+
+        Lets callers iterate line by line (see _iter_lines) instead of
+        materializing the full object as a Python str, which costs 2-4x the
+        object size once decoded.
+        """
+        try:
+            return self.s3_client.get_object(Bucket=bucket, Key=key)['Body']
+        except Exception as e:
+            logger.error(f"Error opening stream for {key}: {e}")
+            return None
+
+    def download_head(self, bucket: str, key: str, max_bytes: int = _PROBE_BYTES) -> Optional[str]:
+        """Download only the first max_bytes of an object via a ranged GET."""
+        try:
+            obj = self.s3_client.get_object(Bucket=bucket, Key=key,
+                                            Range=f'bytes=0-{max_bytes - 1}')
+            return obj['Body'].read().decode('utf-8', errors='replace')
+        except ClientError as e:
+            # Empty objects reject any Range; fall back to a plain GET.
+            if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+                return self.download_file(bucket, key)
+            logger.error(f"Error reading head of {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error reading head of {key}: {e}")
+            return None
+
+    def download_many(self, bucket: str, keys: List[str],
+                      max_workers: int = 16,
+                      max_bytes: Optional[int] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """Download several objects concurrently, yielding (key, content).
+
+        Each get_object is a blocking HTTPS round trip, so serial downloads
+        cost N x RTT; the pool overlaps them (botocore clients are
+        thread-safe). Pairs arrive in completion order; failed downloads
+        yield None as content, mirroring download_file. With max_bytes set,
+        only ranged heads are fetched (see download_head).
+        """
+        if not keys:
+            return
+        if max_bytes is None:
+            fetch = self.download_file
+        else:
+            def fetch(bucket_, key_):
+                return self.download_head(bucket_, key_, max_bytes)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as pool:
+            futures = {pool.submit(fetch, bucket, key): key for key in keys}
+            for fut in as_completed(futures):
+                yield futures[fut], fut.result()
+
+    @staticmethod
+    def _classify_record(data: Dict[str, Any]) -> Optional[str]:
+        """Map one decoded record to 'smartmeter'/'dht' by its keys, or None."""
+        keys = data.keys()
+        # Key dumps are debug-only: this runs once per probed file, and at
+        # INFO level the f-string/list materialization was pure overhead.
+        debug = logger.isEnabledFor(logging.DEBUG)
+        # SmartMeter first, for priority — as the old if-ladder did.
+        if not _SMART_KEYS.isdisjoint(keys):
+            if debug:
+                logger.debug("Detected SmartMeter data: %s", list(keys))
+            return 'smartmeter'
+        if 'ts' in data and not _SMART_ENERGY_KEYS.isdisjoint(keys):
+            if debug:
+                logger.debug("Detected SmartMeter data (ts+energy): %s", list(keys))
+            return 'smartmeter'
+        if not _DHT_KEYS.isdisjoint(keys):
+            if debug:
+                logger.debug("Detected DHT data: %s", list(keys))
+            return 'dht'
+        return None
+
+    def detect_data_type(self, content: str | bytes) -> Optional[str]:
+        """Detect if content is DHT or SmartMeter JSON by examining first valid JSON line.
+
+        With ijson installed the blob is parsed incrementally, so only the
+        bytes up to the first classifiable record are ever decoded — no line
+        list is materialized for multi-MB files. Without ijson, fall back to
+        splitting and probing line by line.
+        """
+        if IJSON_AVAILABLE:
+            raw = content.encode('utf-8') if isinstance(content, str) else content
+            try:
+                # multiple_values handles NDJSON (one top-level map per line).
+                for data in ijson.items(io.BytesIO(raw), '', multiple_values=True):
+                    if not isinstance(data, dict):
+                        continue
+                    kind = self._classify_record(data)
+                    if kind:
+                        return kind
+            except Exception as e:
+                logger.warning(f"ijson detection failed, falling back to line scan: {e}")
+
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
+        # splitlines() handles \r\n and produces no trailing empty element,
+        # unlike split('\n').
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                data = _json_loads(line)
+                kind = self._classify_record(data)
+                if kind:
+                    return kind
+            except Exception as e:
+                logger.warning(f"Failed to parse JSON line: {e}")
+                continue
+        logger.warning(f"Could not detect data type from content (first 200 chars): {content[:200]}")
+        return None
+    
+    @staticmethod
+    def _parse_ndjson_pandas(content: str, columns: tuple) -> List[tuple]:
+        """Parse NDJSON with pandas and emit tuples in the given column order.
+
+        convert_dates=False keeps epoch fields (e.g. timestamp_iso, which
+        matches pandas' date-column heuristic) as the raw ints the line
+        loop produces, so CSV output does not change with payload size.
+        """
+        df = pd.read_json(io.StringIO(content), lines=True, convert_dates=False)
+        df = df.reindex(columns=list(columns))
+        # Missing fields come back as NaN; map them to None so the CSV
+        # writers emit '' exactly like the line-loop path does.
+        df = df.astype(object).where(df.notna(), None)
+        return list(df.itertuples(index=False, name=None))
+
+    def parse_dht_data(self, content) -> List[tuple]:
+        """
+        Parse DHT22 data from JSON lines format (str or StreamingBody) into
+        (timestamp, label, gpio, temperature, humidity) tuples.
+        Expected: {"timestamp_iso": 1765481925, "label": "t1", "gpio": 4, "temperature_c": 16.4, "humidity_rh": 74.6}
+
+        Multi-MB in-memory payloads go through pandas' NDJSON reader, which
+        tokenizes in C instead of one json.loads call per interpreter-level
+        line; streams are consumed line by line without materializing.
+        """
+        if isinstance(content, str) and len(content) >= _PANDAS_MIN_BYTES and _ensure_pandas():
+            try:
+                return self._parse_ndjson_pandas(content, _DHT_FIELDS)
+            except Exception as e:
+                logger.warning(f"pandas DHT parse failed, falling back to line loop: {e}")
+        records = []
+        for line in _iter_lines(content):
+            if not line.strip():
+                continue
+            try:
+                records.append(_map_dht(_json_loads(line)))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Invalid JSON line: {line[:50]}... - {e}")
+        return records
+    
+    def parse_smartmeter_data(self, content) -> List[tuple]:
+        """
+        Parse Smart Meter data from JSON lines (str or StreamingBody) into
+        (timestamp, power, voltage, current, energy) tuples.
+        Expected: {"ts":1765405428638,"apower":37.5,"voltage":229.7,"current":0.291,"energy_total":134.083}
+
+        Multi-MB in-memory payloads go through pandas' NDJSON reader, same
+        as DHT; streams are consumed line by line without materializing.
+        """
+        if isinstance(content, str) and len(content) >= _PANDAS_MIN_BYTES and _ensure_pandas():
+            try:
+                return self._parse_ndjson_pandas(content, _SM_FIELDS)
+            except Exception as e:
+                logger.warning(f"pandas Smart Meter parse failed, falling back to line loop: {e}")
+        records = []
+        for line in _iter_lines(content):
+            if not line.strip():
+                continue
+            try:
+                records.append(_map_smartmeter(_json_loads(line)))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Invalid JSON line: {line[:50]}... - {e}")
+        return records
+    
+    def parse_any(self, content) -> Tuple[Optional[str], List[tuple]]:
+        """Classify and parse NDJSON in one scan.
+
+        detect_data_type followed by parse_* tokenizes every file twice;
+        here the first classifiable record picks the schema and the same
+        pass keeps decoding with that mapper. Returns (kind, records);
+        kind is None (and records empty) when nothing classified.
+        """
+        # Large in-memory payloads: classify from the head, then hand the
+        # whole blob to pandas' C-level NDJSON reader.
+        if isinstance(content, str) and len(content) >= _PANDAS_MIN_BYTES and _ensure_pandas():
+            kind = self.detect_data_type(content)
+            if kind is not None:
+                try:
+                    fields = _DHT_FIELDS if kind == "dht" else _SM_FIELDS
+                    return kind, self._parse_ndjson_pandas(content, fields)
+                except Exception as e:
+                    logger.warning(f"pandas parse failed, falling back to line loop: {e}")
+
+        kind: Optional[str] = None
+        mapper = None
+        records: List[tuple] = []
+        for line in _iter_lines(content):
+            if not line.strip():
+                continue
+            try:
+                data = _json_loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Invalid JSON line: {line[:50]}... - {e}")
+                continue
+            if mapper is None:
+                kind = self._classify_record(data)
+                if kind is None:
+                    continue
+                mapper = _RECORD_MAPPERS[kind]
+            records.append(mapper(data))
+        return kind, records
+
+    def save_dht_to_csv(self, records: List[tuple], filepath: str,
+                        fsync: bool = False) -> bool:
+        """Save DHT record tuples to CSV in dhtlogger format.
+
+        The parser tuples are already in column order, so they feed a single
+        writerows call (C-level iteration) through a 1 MiB buffered writer.
+        The fast path never syncs; pass fsync=True when durability matters.
+        """
+        try:
+            with _open_csv_buffered(filepath) as f:
+                writer = csv.writer(f)
+                writer.writerow(['timestamp_iso', 'label', 'gpio', 'temp_C', 'hum_%'])
+                writer.writerows(records)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            logger.info(f"Saved {len(records)} DHT records to {filepath}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save DHT CSV: {e}")
+            return False
+    
+    def save_smartmeter_to_csv(self, records: List[tuple], filepath: str, device_name: str = "device",
+                               fsync: bool = False) -> bool:
+        """Save Smart Meter record tuples to CSV in smartmeter format.
+
+        Same batched-writerows scheme as save_dht_to_csv; the constant
+        device columns are spliced in here (energy is parsed but not part
+        of this format).
+        """
+        try:
+            rows = [
+                (ts, device_name, device_name, 'imported', power, voltage, current)
+                for ts, power, voltage, current, _energy in records
+            ]
+            with _open_csv_buffered(filepath) as f:
+                writer = csv.writer(f)
+                writer.writerow(['timestamp_iso', 'device', 'device_id', 'ip', 'power_W', 'voltage_V', 'current_A'])
+                writer.writerows(rows)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            logger.info(f"Saved {len(records)} Smart Meter records to {filepath}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save Smart Meter CSV: {e}")
+            return False
+
+
+class AWSTelemetryImportUI:
+    """UI for importing telemetry data from AWS S3."""
+    
+    def __init__(self, parent: tk.Tk):
+        self.parent = parent
+        self.window = tk.Toplevel(parent)
+        self.window.title("Import Telemetry from AWS S3")
+        self.window.geometry("750x650")
+        
+        self.importer: Optional[AWSTelemetryImporter] = None
+        self.selected_bucket = None
+        self.selected_files = []
+        
+        # Session caches: _load_files already downloads and classifies every
+        # candidate, so the import/combine paths read from here instead of
+        # issuing the same GETs again (each key used to be fetched 2-3 times
+        # per session). Cleared whenever the bucket changes.
+        self._content_cache: Dict[str, str] = {}
+        self._type_cache: Dict[str, Optional[str]] = {}
+        
+        # S3 work runs here and posts results back onto the Tk loop via
+        # window.after(), so the dialog never freezes during long scans.
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        self._build_ui()
+    
+    def _on_close(self):
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self.window.destroy()
+    
+    def _set_actions_state(self, state: str):
+        for btn in (self.import_btn, self.import_all_btn,
+                    self.combine_json_btn, self.preview_btn):
+            btn.config(state=state)
+    
+    def _invalidate_caches(self):
+        self._content_cache.clear()
+        self._type_cache.clear()
+    
+    def _get_cached(self, key: str) -> Optional[str]:
+        """Return the object's content, downloading it at most once."""
+        content = self._content_cache.get(key)
+        if content is None:
+            content = self.importer.download_file(self.selected_bucket, key)
+            if content:
+                self._content_cache[key] = content
+        return content
+    
+    def _fetch_into_cache(self, keys) -> None:
+        """Bulk-download any keys not already cached."""
+        to_fetch = [k for k in keys if k not in self._content_cache]
+        for key, content in self.importer.download_many(self.selected_bucket, to_fetch):
+            if content:
+                self._content_cache[key] = content
+    
+    def _detect_cached(self, key: str, content: str) -> Optional[str]:
+        """Classify content, remembering the result per key."""
+        if key in self._type_cache:
+            return self._type_cache[key]
+        detected = self.importer.detect_data_type(content)
+        self._type_cache[key] = detected
+        return detected
+    
+    def _build_ui(self):
+        if not _ensure_boto3():
+            tk.Label(
+                self.window,
+                text="❌ boto3 not installed\n\nInstall with:\npip install boto3",
+                fg="red",
+                font=("Arial", 12),
+                justify="center"
+            ).pack(pady=30)
+            tk.Button(self.window, text="Close", command=self.window.destroy).pack()
+            return
+        
+        # Credentials
+        cred_frame = tk.LabelFrame(self.window, text="AWS Credentials", padx=10, pady=10)
+        cred_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        tk.Label(cred_frame, text="Access Key (optional):").grid(row=0, column=0, sticky="w", padx=5)
+        self.access_key_entry = tk.Entry(cred_frame, width=35, show="*")
+        self.access_key_entry.grid(row=0, column=1, padx=5, pady=2)
+        
+        tk.Label(cred_frame, text="Secret Key (optional):").grid(row=1, column=0, sticky="w", padx=5)
+        self.secret_key_entry = tk.Entry(cred_frame, width=35, show="*")
+        self.secret_key_entry.grid(row=1, column=1, padx=5, pady=2)
+        
+        tk.Label(cred_frame, text="Region:").grid(row=2, column=0, sticky="w", padx=5)
+        self.region_entry = tk.Entry(cred_frame, width=35)
+        self.region_entry.insert(0, "us-east-1")
+        self.region_entry.grid(row=2, column=1, padx=5, pady=2)
+        
+        tk.Button(cred_frame, text="Connect", command=self._connect).grid(row=3, column=1, pady=5, sticky="e")
+        
+        # Buckets
+        bucket_frame = tk.LabelFrame(self.window, text="S3 Buckets", padx=10, pady=10)
+        bucket_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        tk.Label(bucket_frame, text="Select bucket (or enter manually):").pack(anchor="w")
+        self.bucket_listbox = tk.Listbox(bucket_frame, height=4)
+        self.bucket_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.bucket_listbox.bind('<<ListboxSelect>>', self._on_bucket_select)
+
+        manual_bucket = tk.Frame(bucket_frame)
+        manual_bucket.pack(fill=tk.X, pady=4)
+        tk.Label(manual_bucket, text="Bucket name:").pack(side="left", padx=5)
+        self.manual_bucket_entry = tk.Entry(manual_bucket, width=30)
+        self.manual_bucket_entry.pack(side="left", padx=5)
+        tk.Button(manual_bucket, text="Use", command=self._use_manual_bucket).pack(side="left", padx=5)
+        tk.Label(manual_bucket, text="Prefix:").pack(side="left", padx=5)
+        self.prefix_entry = tk.Entry(manual_bucket, width=15)
+        self.prefix_entry.pack(side="left", padx=5)
+        
+        # Files
+        files_frame = tk.LabelFrame(self.window, text="Files (select DHT or Smart Meter logs)", padx=10, pady=10)
+        files_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        tk.Label(files_frame, text="Select files:").pack(anchor="w")
+        self.files_listbox = tk.Listbox(files_frame, height=6, selectmode=tk.MULTIPLE)
+        self.files_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        # Data Type
+        type_frame = tk.Frame(self.window)
+        type_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        tk.Label(type_frame, text="Data Type:").pack(side="left", padx=5)
+        self.data_type_var = tk.StringVar(value="smartmeter")
+        tk.Radiobutton(type_frame, text="DHT22 (Temperature/Humidity)", variable=self.data_type_var, value="dht", command=self._on_data_type_change).pack(side="left", padx=10)
+        tk.Radiobutton(type_frame, text="Smart Meter (Power)", variable=self.data_type_var, value="smartmeter", command=self._on_data_type_change).pack(side="left", padx=10)
+        tk.Radiobutton(type_frame, text="All JSON files", variable=self.data_type_var, value="all", command=self._on_data_type_change).pack(side="left", padx=10)
+        
+        # Actions
+        btn_frame = tk.Frame(self.window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.import_btn = tk.Button(btn_frame, text="Import to devices/", command=self._import_data, state="disabled")
+        self.import_btn.pack(side="left", padx=5)
+        
+        self.import_all_btn = tk.Button(btn_frame, text="Import ALL to one CSV", command=self._import_all, state="disabled")
+        self.import_all_btn.pack(side="left", padx=5)
+
+        self.combine_json_btn = tk.Button(btn_frame, text="Combine ALL to one JSON", command=self._combine_all_json, state="disabled")
+        self.combine_json_btn.pack(side="left", padx=5)
+        
+        self.preview_btn = tk.Button(btn_frame, text="Preview Data", command=self._preview_data, state="disabled")
+        self.preview_btn.pack(side="left", padx=5)
+        
+        tk.Button(btn_frame, text="Close", command=self.window.destroy).pack(side="right", padx=5)
+        
+        # Status
+        self.status_label = tk.Label(self.window, text="Status: Not connected", fg="gray", font=("Arial", 9))
+        self.status_label.pack(pady=5)
+    
+    def _connect(self):
+        access_key = self.access_key_entry.get().strip() or None
+        secret_key = self.secret_key_entry.get().strip() or None
+        region = self.region_entry.get().strip() or "us-east-1"
+        
+        try:
+            self.importer = AWSTelemetryImporter(access_key, secret_key, region)
+            self.status_label.config(text="✓ Connected to AWS", fg="green")
+            self._load_buckets()
+        except Exception as e:
+            messagebox.showerror("Connection Error", f"Failed to connect:\n{str(e)}")
+            self.status_label.config(text="✗ Connection failed", fg="red")
+    
+    def _load_buckets(self):
+        if not self.importer:
+            return
+        
+        try:
+            buckets = self.importer.list_buckets()
+            self.bucket_listbox.delete(0, tk.END)
+            for bucket in buckets:
+                self.bucket_listbox.insert(tk.END, bucket)
+            
+            if not buckets:
+                messagebox.showinfo(
+                    "No Buckets",
+                    "No S3 buckets found. If you know the bucket name, enter it manually."
+                )
+        except Exception as e:
+            msg = str(e)
+            if "AccessDenied" in msg or "not authorized" in msg:
+                messagebox.showinfo(
+                    "Permission Required",
+                    "Your IAM user lacks 's3:ListAllMyBuckets'. Enter the bucket name manually."
+                )
+            else:
+                messagebox.showerror("Error", f"Failed to list buckets:\n{msg}")
+    
+    def _on_bucket_select(self, event):
+        sel = self.bucket_listbox.curselection()
+        if not sel:
+            return
+        
+        self.selected_bucket = self.bucket_listbox.get(sel[0])
+        self._invalidate_caches()
+        self.manual_bucket_entry.delete(0, tk.END)
+        self.manual_bucket_entry.insert(0, self.selected_bucket)
+        self._load_files()
+
+    def _use_manual_bucket(self):
+        bucket = (self.manual_bucket_entry.get() or "").strip()
+        if not bucket:
+            messagebox.showwarning("Bucket Required", "Please enter a bucket name.")
+            return
+        self.selected_bucket = bucket
+        self._invalidate_caches()
+        self.status_label.config(text=f"Using bucket: {bucket}", fg="blue")
+        self._load_files()
+    
+    def _on_data_type_change(self):
+        """Reload files when data type selection changes."""
+        self._load_files()
+    
+    def _load_files(self):
+        if not self.importer or not self.selected_bucket:
+            return
+        
+        self.status_label.config(text=f"Loading files from '{self.selected_bucket}'...", fg="blue")
+        self._set_actions_state("disabled")
+        
+        data_type = self.data_type_var.get()
+        prefix = self.prefix_entry.get().strip()
+        future = self._io_pool.submit(self._scan_bucket, prefix, data_type)
+        future.add_done_callback(
+            lambda f: self.window.after(0, self._on_files_scanned, f, data_type)
+        )
+    
+    def _scan_bucket(self, prefix: str, data_type: str):
+        """Worker: list, probe and classify candidates. No widget access here."""
+        objects = self.importer.list_objects(self.selected_bucket, prefix=prefix)
+        
+        candidates = []
+        json_count = 0
+        for obj in objects:
+            key = obj.get('Key', '')
+            # Only check files with JSON-like extensions
+            if not key.endswith(_ACCEPTED_EXTS):
+                logger.debug("Skipping %s (unsupported extension)", key)
+                continue
+            if key.endswith('.json'):
+                json_count += 1
+            candidates.append(key)
+        
+        # Well-named keys (smartmeter/2024-01.json, dht22_t1.log, ...) are
+        # classified from the name alone, skipping the probe download.
+        for key in candidates:
+            if key not in self._type_cache:
+                hinted = _classify_by_key(key)
+                if hinted is not None:
+                    self._type_cache[key] = hinted
+        
+        # Classify the rest from 4 KiB ranged probes fetched concurrently —
+        # the full objects are only downloaded if the user actually imports
+        # them. Processed in listing order so the listbox stays stable.
+        probes = dict(self.importer.download_many(
+            self.selected_bucket,
+            [k for k in candidates if k not in self._type_cache],
+            max_bytes=_PROBE_BYTES,
+        ))
+        
+        entries = []
+        for key in candidates:
+            if key in self._type_cache:
+                detected_type = self._type_cache[key]
+            else:
+                probe = probes.get(key)
+                if not probe:
+                    logger.warning("Empty or failed download: %s", key)
+                    continue
+                detected_type = self.importer.detect_data_type(probe)
+                self._type_cache[key] = detected_type
+            logger.debug("File %s detected as: %s (looking for: %s)", key, detected_type, data_type)
+            
+            # Only include files matching selected data type (or all if data_type == 'all')
+            if data_type == 'all' or detected_type == data_type:
+                display_text = f"{key} [{detected_type or 'unknown'}]" if data_type == 'all' else key
+                entries.append(display_text)
+        
+        logger.info("Scanned %d objects: %d JSON files, %d matched %s type",
+                    len(objects), json_count, len(entries), data_type)
+        return entries
+    
+    def _on_files_scanned(self, future, data_type: str):
+        try:
+            entries = future.result()
+            self.files_listbox.delete(0, tk.END)
+            if entries:
+                self.files_listbox.insert(tk.END, *entries)
+            
+            if not entries:
+                msg = "No DHT22 files found" if data_type == "dht" else ("No Smart Meter files found" if data_type == "smartmeter" else "No JSON files found")
+                self.status_label.config(text=msg, fg="orange")
+                messagebox.showinfo("No Files", f"{msg} in bucket '{self.selected_bucket}'.")
+            else:
+                self.status_label.config(text=f"✓ Loaded {len(entries)} file(s)", fg="green")
+                self._set_actions_state("normal")
+        except tk.TclError:
+            pass  # Window closed while scanning.
+        except Exception as e:
+            self.status_label.config(text="✗ Failed to list files", fg="red")
+            msg = str(e)
+            if "NoSuchBucket" in msg:
+                messagebox.showerror("Bucket Not Found", f"Bucket '{self.selected_bucket}' not found or not accessible.")
+            elif "AccessDenied" in msg:
+                messagebox.showerror("Access Denied", f"Missing permission s3:ListBucket on '{self.selected_bucket}'.")
+            else:
+                messagebox.showerror("Error", f"Failed to list files:\n{msg}")
+    
+    def _import_data(self):
+        sel = self.files_listbox.curselection()
+        if not sel:
+            messagebox.showwarning("No Selection", "Please select at least one file.")
+            return
+        
+        files = [self.files_listbox.get(i) for i in sel]
+        data_type = self.data_type_var.get()
+        
+        # Ask for output base name
+        default_name = "dht_import" if data_type == "dht" else "smartmeter_import"
+        output_name = tk.simpledialog.askstring(
+            "Output CSV name",
+            "Enter the name for the new CSV (without .csv):",
+            parent=self.window,
+            initialvalue=default_name
+        )
+        if not output_name:
+            return
+        
+        original_name = output_name
+        output_name = _sanitize_name(output_name)
+        
+        # Add prefix if not already present
+        if data_type == "dht" and not output_name.startswith("dht_"):
+            output_name = f"dht_{output_name}"
+        elif data_type == "smartmeter" and not output_name.startswith("smartmeter_"):
+            output_name = f"smartmeter_{output_name}"
+        
+        print(f"DEBUG: original='{original_name}', sanitized='{_sanitize_name(original_name)}', data_type='{data_type}', final='{output_name}'")
+        
+        logs_dir = str(ensure_devices_dir())
+        
+        self.status_label.config(text=f"Importing {len(files)} file(s)...", fg="blue")
+        self.window.update()
+        
+        combined_records = []
+        for file_key in files:
+            # Cached text is reused; uncached files are parsed straight off
+            # the socket so the raw blob never sits in memory.
+            source = self._content_cache.get(file_key)
+            if source is None:
+                source = self.importer.download_stream(self.selected_bucket, file_key)
+            if source is None:
+                continue
+            
+            kind, records = self.importer.parse_any(source)
+            if kind == data_type:
+                combined_records.extend(records)
+        
+        if not combined_records:
+            self.status_label.config(text="✗ Import failed", fg="red")
+            messagebox.showerror("Import Failed", "No data could be imported.")
+            return
+        
+        if data_type == "dht":
+            dest = os.path.join(logs_dir, f"{output_name}.csv")
+            ok = self.importer.save_dht_to_csv(combined_records, dest)
+        else:
+            dest = os.path.join(logs_dir, f"{output_name}.csv")
+            ok = self.importer.save_smartmeter_to_csv(combined_records, dest, device_name=output_name)
+        
+        if ok:
+            self.status_label.config(text=f"✓ Imported to {dest}", fg="green")
+            messagebox.showinfo(
+                "Import Complete",
+                f"Saved {len(combined_records)} rows to:\n{dest}\n\n"
+                f"Use 'Generate graphs' in Simulation menu to visualize."
+            )
+        else:
+            self.status_label.config(text="✗ Import failed", fg="red")
+            messagebox.showerror("Import Failed", "Unable to save CSV.")
+
+    def _import_all(self):
+        if not self.selected_bucket:
+            messagebox.showwarning("No Bucket", "Please select or enter a bucket first.")
+            return
+
+        data_type = self.data_type_var.get()
+        
+        # Determine default name and actual processing type
+        if data_type == 'all':
+            default_name = "combined_all"
+            process_as = 'smartmeter'  # Default to smartmeter for 'all' mode
+        else:
+            default_name = "dht_all" if data_type == "dht" else "smartmeter_all"
+            process_as = data_type
+            
+        output_name = tk.simpledialog.askstring(
+            "Output CSV name",
+            "Enter the name for the combined CSV (without .csv):",
+            parent=self.window,
+            initialvalue=default_name
+        )
+        if not output_name:
+            return
+        output_name = _sanitize_name(output_name)
+        
+        # Add prefix if not already present
+        if process_as == "dht" and not output_name.startswith("dht_"):
+            output_name = f"dht_{output_name}"
+        elif process_as == "smartmeter" and not output_name.startswith("smartmeter_"):
+            output_name = f"smartmeter_{output_name}"
+        
+        logs_dir = str(ensure_devices_dir())
+
+        self.status_label.config(text=f"Importing ALL files from '{self.selected_bucket}'...", fg="blue")
+        self._set_actions_state("disabled")
+        
+        prefix = self.prefix_entry.get().strip()
+        future = self._io_pool.submit(
+            self._import_all_worker, prefix, data_type, process_as, output_name, logs_dir
+        )
+        future.add_done_callback(
+            lambda f: self.window.after(0, self._on_import_all_done, f, data_type)
+        )
+    
+    def _import_all_worker(self, prefix: str, data_type: str, process_as: str,
+                           output_name: str, logs_dir: str):
+        """Worker: list, classify, parse and save. No widget access here."""
+        objects = self.importer.list_objects(self.selected_bucket, prefix=prefix)
+
+        # Filter by file type, fetch anything not already cached by
+        # _load_files, then classify and parse from memory.
+        candidates = [obj.get('Key', '') for obj in objects
+                      if obj.get('Key', '').endswith(_ACCEPTED_EXTS)]
+        self._fetch_into_cache(candidates)
+
+        # One scan per file: parse_any classifies on the first record and
+        # keeps parsing, so nothing is tokenized twice.
+        combined_records = []
+        n_matched = 0
+        for key in candidates:
+            content = self._content_cache.get(key)
+            if not content:
+                continue
+            
+            kind, records = self.importer.parse_any(content)
+            self._type_cache[key] = kind
+            if data_type != 'all' and kind != data_type:
+                continue
+            n_matched += 1
+            combined_records.extend(records)
+        
+        if not n_matched:
+            return ('no_files',)
+        if not combined_records:
+            return ('no_records',)
+
+        dest = os.path.join(logs_dir, f"{output_name}.csv")
+        # Save based on process_as type
+        if process_as == "dht":
+            ok = self.importer.save_dht_to_csv(combined_records, dest)
+        else:
+            ok = self.importer.save_smartmeter_to_csv(combined_records, dest, device_name=output_name)
+        if not ok:
+            return ('save_failed',)
+        return ('ok', dest, len(combined_records), n_matched)
+    
+    def _on_import_all_done(self, future, data_type: str):
+        try:
+            result = future.result()
+            self._set_actions_state("normal")
+            if result[0] == 'no_files':
+                self.status_label.config(text="No matching files found", fg="orange")
+                msg = "No DHT22 files found" if data_type == "dht" else ("No Smart Meter files found" if data_type == "smartmeter" else "No JSON files found")
+                messagebox.showinfo("No Files", f"{msg} in this bucket.")
+            elif result[0] == 'no_records':
+                self.status_label.config(text="✗ Import failed", fg="red")
+                messagebox.showerror("Import Failed", "No data could be imported from the bucket.")
+            elif result[0] == 'save_failed':
+                self.status_label.config(text="✗ Import failed", fg="red")
+                messagebox.showerror("Import Failed", "Unable to save CSV.")
+            else:
+                _, dest, n_rows, n_files = result
+                self.status_label.config(text=f"✓ Imported {n_rows} rows from {n_files} files", fg="green")
+                messagebox.showinfo(
+                    "Import Complete",
+                    f"Saved {n_rows} rows from {n_files} files to:\n{dest}\n\n"
+                    f"Use 'Generate graphs' to visualize."
+                )
+        except tk.TclError:
+            pass  # Window closed while importing.
+        except Exception as e:
+            self.status_label.config(text="✗ Import failed", fg="red")
+            messagebox.showerror("Error", f"Import failed:\n{e}")
+
+    def _combine_all_json(self):
+        if not self.selected_bucket:
+            messagebox.showwarning("No Bucket", "Please select or enter a bucket first.")
+            return
+
+        data_type = self.data_type_var.get()
+        default_name = "dht_all" if data_type == "dht" else "smartmeter_all"
+        output_name = tk.simpledialog.askstring(
+            "Output JSON name",
+            "Enter the name for the combined JSON (without .json):",
+            parent=self.window,
+            initialvalue=default_name
+        )
+        if not output_name:
+            return
+        output_name = _sanitize_name(output_name)
+        logs_dir = str(ensure_devices_dir())
+
+        self.status_label.config(text=f"Combining ALL JSON from '{self.selected_bucket}'...", fg="blue")
+        self._set_actions_state("disabled")
+        
+        prefix = self.prefix_entry.get().strip()
+        future = self._io_pool.submit(self._combine_all_worker, prefix, data_type, output_name, logs_dir)
+        future.add_done_callback(
+            lambda f: self.window.after(0, self._on_combine_done, f, data_type)
+        )
+    
+    def _combine_all_worker(self, prefix: str, data_type: str,
+                            output_name: str, logs_dir: str):
+        """Worker: list, classify and concatenate NDJSON. No widget access here."""
+        objects = self.importer.list_objects(self.selected_bucket, prefix=prefix)
+
+        # Filter by file type, fetch anything not already cached, classify.
+        candidates = [obj.get('Key', '') for obj in objects
+                      if obj.get('Key', '').endswith(_ACCEPTED_EXTS)]
+        self._fetch_into_cache(candidates)
+
+        target_keys = []
+        for key in candidates:
+            content = self._content_cache.get(key)
+            if not content:
+                continue
+            
+            detected_type = self._detect_cached(key, content)
+            if detected_type == data_type:
+                target_keys.append((key, content))
+        
+        if not target_keys:
+            return ('no_files',)
+
+        dest = os.path.join(logs_dir, f"{output_name}.json")
+        # Stream the raw NDJSON lines straight to disk: collecting them in a
+        # list and joining peaked at roughly twice the aggregate size in
+        # memory. The 1 MiB buffer keeps the actual writes large.
+        written = 0
+        with open(dest, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for key, content in target_keys:
+                for ln in content.splitlines():
+                    if ln.strip():
+                        f.write(ln)
+                        f.write('\n')
+                        written += 1
+
+        if not written:
+            os.remove(dest)
+            return ('no_lines',)
+        return ('ok', dest, written, len(target_keys))
+    
+    def _on_combine_done(self, future, data_type: str):
+        try:
+            result = future.result()
+            self._set_actions_state("normal")
+            if result[0] == 'no_files':
+                self.status_label.config(text="No matching files found", fg="orange")
+                msg = "No DHT22 files found" if data_type == "dht" else "No Smart Meter files found"
+                messagebox.showinfo("No Files", f"{msg} in this bucket.")
+            elif result[0] == 'no_lines':
+                self.status_label.config(text="✗ Combine failed", fg="red")
+                messagebox.showerror("Combine Failed", "No data could be combined from the bucket.")
+            else:
+                _, dest, n_lines, n_files = result
+                self.status_label.config(text=f"✓ Combined {n_lines} lines from {n_files} files", fg="green")
+                messagebox.showinfo(
+                    "Combine Complete",
+                    f"Saved {n_lines} JSON lines from {n_files} files to:\n{dest}"
+                )
+        except tk.TclError:
+            pass  # Window closed while combining.
+        except Exception as e:
+            self.status_label.config(text="✗ Combine failed", fg="red")
+            messagebox.showerror("Combine Failed", f"Unable to save JSON file:\n{e}")
+    
+    def _preview_data(self):
+        sel = self.files_listbox.curselection()
+        if not sel:
+            messagebox.showwarning("No Selection", "Select a file to preview.")
+            return
+        
+        file_key = self.files_listbox.get(sel[0])
+        # Reuse cached text if an import already fetched it; otherwise a
+        # 128 KiB ranged GET is plenty for a 100-line preview — no reason to
+        # pull a multi-GB log to show its head.
+        content = self._content_cache.get(file_key)
+        truncated_fetch = False
+        if content is None:
+            content = self.importer.download_head(
+                self.selected_bucket, file_key, max_bytes=_PREVIEW_BYTES
+            )
+            # Only files that fill the ranged GET can have been cut off;
+            # anything shorter came back whole.
+            truncated_fetch = bool(content) and len(content) == _PREVIEW_BYTES
+        
+        if not content:
+            messagebox.showerror("Error", "Failed to download file.")
+            return
+        
+        # Preview window
+        prev = tk.Toplevel(self.window)
+        prev.title(f"Preview: {file_key}")
+        prev.geometry("700x500")
+        
+        tk.Label(prev, text=f"File: {file_key}", font=("Arial", 10, "bold")).pack(pady=5)
+        
+        text = scrolledtext.ScrolledText(prev, wrap=tk.WORD, width=80, height=25)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Show first 100 lines; maxsplit bounds the split work, everything
+        # past line 101 stays a single unsplit tail.
+        lines = content.split('\n', 101)[:100]
+        text.insert(tk.END, '\n'.join(lines))
+        if len(lines) == 100 or truncated_fetch:
+            text.insert(tk.END, "\n\n... (showing first 100 lines)")
+        text.config(state=tk.DISABLED)
+        
+        tk.Button(prev, text="Close", command=prev.destroy).pack(pady=10)
+
+
+def open_aws_telemetry_ui(parent: tk.Tk):
+    """Open AWS telemetry import dialog."""
+    AWSTelemetryImportUI(parent)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import os, csv, shutil, json, glob
-from tkinter import messagebox, filedialog, simpledialog
+import io
+import os, csv, shutil, json, glob, re, stat, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+# ttk and simpledialog are only needed by the interactive dialogs below and
+# are imported there; `import tkinter` alone does not pull them in.
+from tkinter import messagebox, filedialog
 import tkinter as tk
-from tkinter import ttk
 from datetime import datetime
 from point import points
 from wall import walls
@@ -18,6 +21,12 @@ from app.logging_setup import setup_logging
 from app.save_paths import ensure_houses_dir, ensure_saves_dir, ensure_devices_dir
 from models import Point, Sensor, Device, Door
 
+try:  # optional: much faster JSON parsing for the ndjson import paths
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 def _ask_overwrite_or_append(parent, dest_path: str) -> str:
     """Ask user if they want to overwrite or append when file exists.
@@ -79,6 +88,34 @@ def _door_to_tuple(d: Door | tuple) -> tuple:
     return d
 
 
+# Numeric fields are coerced once at ingest (read_coordinates_from_file and
+# the add-sensor/add-device dialogs), so the row builders only substitute
+# "None" for optional fields and pass everything else through untouched.
+
+def _sensor_row(s: Sensor | tuple) -> tuple | list:
+    t = _sensor_to_tuple(s)
+    # Fast path: nothing to substitute, hand the tuple straight to the
+    # csv writer without unpacking and rebuilding the row.
+    if t[8] is not None and t[9] is not None:
+        return t
+    (name, x, y, typ, min_val, max_val, step, state,
+     direction, consumption, associated_device) = t
+    return [
+        name, x, y, typ, min_val, max_val, step, state,
+        direction if direction is not None else "None",
+        consumption if consumption is not None else "None",
+        associated_device,
+    ]
+
+
+def _device_row(d: Device | tuple) -> list:
+    (name, x, y, typ, power, state, min_c, max_c, curr_c, c_dir) = _device_to_tuple(d)
+    return [
+        name, x, y, typ, power, state, min_c, max_c, curr_c,
+        c_dir if c_dir is not None else "None",
+    ]
+
+
 def merge_smartmeter_files(logs_dir: str = "logs") -> bool:
     """
     Merge all smartmeter_a_*.csv files into a single smartmeter_a.csv file.
@@ -97,35 +134,38 @@ def merge_smartmeter_files(logs_dir: str = "logs") -> bool:
         
         # Output file path
         output_file = os.path.join(logs_dir, "smartmeter_a.csv")
-        
-        # Write header and all data rows
-        with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-            writer = None
-            total_rows = 0
-            
-            for i, filepath in enumerate(input_files):
+
+        # All parts share the same schema, so this is a pure concatenation:
+        # write the header once, then append each file's bytes wholesale.
+        # No per-row csv parse/re-quote, the copy is I/O bound.
+        total_rows = 0
+        with open(output_file, 'wb', buffering=1 << 20) as outfile:
+            wrote_header = False
+            for filepath in input_files:
                 logger.info("Processing: %s", os.path.basename(filepath))
-                
-                with open(filepath, 'r', encoding='utf-8') as infile:
-                    reader = csv.reader(infile)
-                    
-                    # Read header
-                    try:
-                        header = next(reader)
-                    except StopIteration:
+
+                with open(filepath, 'rb', buffering=1 << 20) as infile:
+                    header = infile.readline()
+                    if not header:
                         logger.warning("File %s is empty", filepath)
                         continue
-                    
-                    # Write header only on first file
-                    if i == 0:
-                        writer = csv.writer(outfile, quoting=csv.QUOTE_NONE, escapechar='\\')
-                        writer.writerow(header)
-                    
-                    # Write all data rows (skip header)
-                    for row in reader:
-                        writer.writerow(row)
+                    if not wrote_header:
+                        outfile.write(header)
+                        wrote_header = True
+
+                    last = b'\n'
+                    while True:
+                        buf = infile.read(1 << 20)
+                        if not buf:
+                            break
+                        outfile.write(buf)
+                        total_rows += buf.count(b'\n')
+                        last = buf[-1:]
+                    # Keep rows intact if a part lacks a trailing newline.
+                    if last != b'\n':
+                        outfile.write(b'\n')
                         total_rows += 1
-        
+
         logger.info("Merge completed! Combined %d data rows into %s", total_rows, output_file)
         return True
     
@@ -151,18 +191,52 @@ def _convert_timestamp(ts):
         return ""
 
 
-def _parse_json_to_records(content: str, data_type: str) -> list:
-    """Parse JSON lines to records based on data type."""
+def _convert_timestamps_bulk(ts_list: list) -> list:
+    """Vectorized _convert_timestamp: one pandas pass over the whole column."""
+    try:
+        import pandas as pd
+    except ImportError:
+        return [_convert_timestamp(ts) for ts in ts_list]
+
+    from dateutil import tz  # ships with pandas
+
+    ser = pd.to_numeric(pd.Series(ts_list), errors='coerce')
+    # millisecond (JS) timestamps to seconds, same cutoff as the scalar path
+    ser = ser.where(ser <= 10000000000, ser / 1000)
+    dt = pd.to_datetime(ser, unit='s', errors='coerce', utc=True)
+    # fromtimestamp renders local wall time; tzlocal() applies the correct
+    # offset per instant (a fixed utcoffset snapshot would shift every
+    # record on the far side of a DST transition by an hour).
+    dt = dt.dt.tz_convert(tz.tzlocal()).dt.tz_localize(None)
+    iso = dt.dt.strftime("%Y-%m-%d %H:%M:%S.%f").str[:-3]
+    # empty/zero/unparseable inputs render as "" exactly like the scalar path
+    out = iso.where(dt.notna() & (ser != 0), "").fillna("").tolist()
+    # Equivalence guard: the column ends must agree with the scalar
+    # reference; if they do not, trust the scalar path for the whole
+    # column (timestamps are both the primary column and the dedup key).
+    if out and any(out[i] != _convert_timestamp(ts_list[i]) for i in (0, len(out) - 1)):
+        return [_convert_timestamp(ts) for ts in ts_list]
+    return out
+
+
+def _parse_json_to_records(content, data_type: str) -> list:
+    """Parse JSON lines to records based on data type.
+
+    `content` may be a whole blob (str) or any iterable of lines, e.g. a
+    streaming body; lines are consumed one at a time either way instead
+    of materializing a second copy of the blob via split().
+    """
+    lines = io.StringIO(content) if isinstance(content, str) else content
     records = []
-    for line in content.strip().split('\n'):
+    for line in lines:
         if not line.strip():
             continue
         try:
-            data = json.loads(line)
+            data = _json_loads(line)
             if data_type == "smartmeter":
                 # SmartMeter format: {"ts":1765405428639,"apower":37.5,"voltage":229.7,"current":0.291,"energy_total":134.083}
                 records.append({
-                    'timestamp': _convert_timestamp(data.get('ts')),
+                    'timestamp': data.get('ts'),
                     'power': data.get('apower') or data.get('power') or data.get('power_w'),
                     'voltage': data.get('voltage') or data.get('voltage_v'),
                     'current': data.get('current') or data.get('current_a'),
@@ -171,7 +245,7 @@ def _parse_json_to_records(content: str, data_type: str) -> list:
             elif data_type == "dht":
                 # DHT format: {"timestamp_iso": ..., "label": "t1", "gpio": 4, "temperature_c": 16.4, "humidity_rh": 74.6}
                 records.append({
-                    'timestamp': _convert_timestamp(data.get('timestamp_iso') or data.get('ts')),
+                    'timestamp': data.get('timestamp_iso') or data.get('ts'),
                     'label': data.get('label'),
                     'gpio': data.get('gpio'),
                     'temperature': data.get('temperature_c'),
@@ -179,10 +253,37 @@ def _parse_json_to_records(content: str, data_type: str) -> list:
                 })
         except json.JSONDecodeError as e:
             logger.warning(f"Invalid JSON line: {line[:50]}... - {e}")
+
+    # Convert the whole timestamp column in one pass instead of a
+    # per-record fromtimestamp/strftime round trip.
+    if records:
+        for r, iso in zip(records, _convert_timestamps_bulk([r['timestamp'] for r in records])):
+            r['timestamp'] = iso
     return records
 
 
-def _save_records_to_csv(records: list, filepath: str, data_type: str, device_name: str = "", ip: str = "", append_mode: bool = False) -> None:
+def _write_ts_sidecar(filepath: str, sorted_ts: list) -> None:
+    """Write delta-encoded epoch-ms timestamps to '<filepath>.ts.bpk'.
+
+    The npz archive holds the absolute first timestamp as int64 ('base')
+    and the deltas between consecutive timestamps as uint32 ('deltas');
+    smartmeter data is near-monotonic, so the deltas are tiny. Readers
+    rebuild the full column with
+    np.concatenate([base, base + np.cumsum(deltas, dtype=np.int64)]).
+    """
+    try:
+        import numpy as np
+        ts_ms = np.array(
+            [int(datetime.strptime(ts, "%Y-%m-%d %H:%M:%S.%f").timestamp() * 1000)
+             for ts in sorted_ts],
+            dtype=np.int64)
+        with open(filepath + ".ts.bpk", "wb") as f:
+            np.savez(f, base=ts_ms[:1], deltas=np.diff(ts_ms).astype(np.uint32))
+    except Exception as e:
+        logger.warning("Timestamp sidecar not written for %s: %s", filepath, e)
+
+
+def _save_records_to_csv(records: list, filepath: str, data_type: str, device_name: str = "", ip: str = "", append_mode: bool = False, ts_sidecar: bool = False) -> None:
     """Save records to CSV file. If append_mode is True, append to existing file (skip headers) and deduplicate by timestamp."""
     if not records:
         return
@@ -193,7 +294,7 @@ def _save_records_to_csv(records: list, filepath: str, data_type: str, device_na
     existing_data = {}
     if append_mode and file_exists:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
+            with open(filepath, 'r', encoding='utf-8', buffering=1 << 20) as f:
                 reader = csv.reader(f)
                 next(reader, None)  # Skip header
                 for row in reader:
@@ -235,9 +336,15 @@ def _save_records_to_csv(records: list, filepath: str, data_type: str, device_na
     
     # Merge: existing_data + new_data (new data overwrites duplicates)
     merged_data = {**existing_data, **new_data}
-    
+    sorted_ts = sorted(merged_data.keys())
+
+    # Opt-in compact timestamp companion; the CSV keeps its timestamp
+    # column so every existing reader still works.
+    if ts_sidecar and data_type == "smartmeter" and sorted_ts:
+        _write_ts_sidecar(filepath, sorted_ts)
+
     # Write merged data
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
         writer = csv.writer(f, quoting=csv.QUOTE_NONE, escapechar='\\')
         
         # Write header
@@ -246,25 +353,88 @@ def _save_records_to_csv(records: list, filepath: str, data_type: str, device_na
         elif data_type == "dht":
             writer.writerow(['timestamp_iso', 'label', 'gpio', 'temp_C', 'hum_%'])
         
-        # Write all merged rows (sorted by timestamp)
-        for ts in sorted(merged_data.keys()):
-            writer.writerow(merged_data[ts])
+        # Write all merged rows (sorted by timestamp), one C-level call
+        writer.writerows(map(merged_data.__getitem__, sorted_ts))
+
+
+def _read_scenario_h5(filename: str) -> tuple:
+    """Read a scenario written by _write_scenario_h5.
+
+    Returns the same five typed tuple lists read_coordinates_from_file
+    produces, so loading is format-transparent downstream.
+    """
+    try:
+        import h5py
+    except ImportError:
+        messagebox.showerror(
+            "h5py Required",
+            "Loading HDF5 scenarios requires h5py.\n\nInstall with:\npip install h5py"
+        )
+        return [], [], [], [], []
+
+    def _opt(v: str):
+        # "None" or empty means None, otherwise float (same as the CSV loader)
+        return None if v in ("", "None") else float(v)
+
+    sections = {}
+    with h5py.File(filename, "r") as h5:
+        for name in ("Positions", "Walls", "Sensors", "Devices", "Doors"):
+            rows = h5[name][()] if name in h5 else ()
+            sections[name] = [
+                [c.decode('utf-8') if isinstance(c, bytes) else str(c) for c in row]
+                for row in rows
+            ]
+
+    pts = [(n, int(float(x)), int(float(y))) for n, x, y in sections["Positions"]]
+    walls_l = [(p1, p2) for p1, p2 in sections["Walls"]]
+    sens = [
+        (r[0], int(float(r[1])), int(float(r[2])), r[3],
+         float(r[4]), float(r[5]), float(r[6]), float(r[7]),
+         _opt(r[8]), _opt(r[9]),
+         # Older files stored a missing associated_device as "None";
+         # keep it falsy like the CSV path's empty string.
+         "" if r[10] in ("", "None") else r[10])
+        for r in sections["Sensors"]
+    ]
+    devs = [
+        (r[0], int(float(r[1])), int(float(r[2])), r[3],
+         int(float(r[4])), int(float(r[5])), int(float(r[6])),
+         int(float(r[7])), int(float(r[8])), int(float(r[9])))
+        for r in sections["Devices"]
+    ]
+    drs = [
+        (int(float(r[0])), int(float(r[1])), int(float(r[2])), int(float(r[3])), r[4])
+        for r in sections["Doors"]
+    ]
+    return pts, walls_l, sens, devs, drs
 
 
 def _load_scenario(ctx: AppContext, canvas, filename: str) -> None:
     """Load the scenario from 'filename' and draw it on the canvas."""
-    (ctx.r_points,
-     ctx.read_walls,
-     ctx.read_sensors,
-     ctx.read_devices,
-     ctx.read_doors) = read_coordinates_from_file(filename)
+    if filename.lower().endswith(('.h5', '.hdf5')):
+        (ctx.r_points,
+         ctx.read_walls,
+         ctx.read_sensors,
+         ctx.read_devices,
+         ctx.read_doors) = _read_scenario_h5(filename)
+    else:
+        (ctx.r_points,
+         ctx.read_walls,
+         ctx.read_sensors,
+         ctx.read_devices,
+         ctx.read_doors) = read_coordinates_from_file(filename)
 
     ctx.load_active = True
     ctx.current_file = filename
 
+    # Let Tk repaint between draw phases so large scenarios appear
+    # progressively instead of freezing the window until the end.
     draw_points(ctx.r_points, canvas)
+    canvas.update_idletasks()
     draw_walls(ctx.read_walls, ctx.r_points, canvas)
+    canvas.update_idletasks()
     draw_sensors(ctx.read_sensors, canvas)
+    canvas.update_idletasks()
     draw_devices(ctx.read_devices, canvas)
     draw_doors(ctx.read_doors, canvas)
 
@@ -291,70 +461,88 @@ def load_scenario_from_file(ctx: AppContext, canvas) -> None:
     _load_scenario(ctx, canvas, default_file)
 
 
-def _write_scenario(ctx: AppContext, filename: str) -> None:
+def _serialize_section(section: tuple) -> str:
+    """Render one (title, rows) scenario section to CSV text in memory."""
+    title, rows = section
+    buf = io.StringIO()
+    w = csv.writer(buf, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+    w.writerow([title])
+    w.writerows(rows)
+    return buf.getvalue()
+
+
+def _write_scenario_h5(ctx: AppContext, filename: str) -> None:
+    """Write the current scenario to an HDF5 file, one dataset per section.
+
+    Cells are stored as utf-8 strings (the same values the CSV writer would
+    emit), so the format stays a drop-in alternative to the CSV layout.
+    """
+    try:
+        import h5py
+    except ImportError:
+        messagebox.showerror(
+            "h5py Required",
+            "Saving to HDF5 requires h5py.\n\nInstall with:\npip install h5py"
+        )
+        return
+
+    load = ctx.load_active
+    sections = {
+        "Positions": [_point_to_tuple(p) for p in (points if not load else ctx.r_points)],
+        "Walls": list(zip(walls[0::2], walls[1::2])) if not load else list(ctx.read_walls),
+        "Sensors": [_sensor_row(s) for s in (sensors if not load else ctx.read_sensors)],
+        "Devices": [_device_row(d) for d in (devices if not load else ctx.read_devices)],
+        "Doors": [list(_door_to_tuple(d)) for d in (doors if not load else ctx.read_doors)],
+    }
+
+    str_dtype = h5py.string_dtype(encoding="utf-8")
+    with h5py.File(filename, "w") as h5:
+        for name, rows in sections.items():
+            # None renders as '' just like the CSV writer, not as "None".
+            data = [["" if cell is None else str(cell) for cell in row] for row in rows]
+            if data:
+                h5.create_dataset(name, data=data, dtype=str_dtype, compression="gzip")
+            else:
+                h5.create_dataset(name, shape=(0, 0), dtype=str_dtype)
+
+    logger.info("Scenario saved successfully to %s.", filename)
+    messagebox.showinfo("Saved", f"Scenario saved successfully to:\n{filename}")
+
+
+def _write_scenario(ctx: AppContext, filename: str, confirm: bool = True) -> None:
     """Write the current scenario to the given file."""
-    if not messagebox.askyesno("Save", f"Do you want to save to:\n{filename}?"):
+    if confirm and not messagebox.askyesno("Save", f"Do you want to save to:\n{filename}?"):
         return
 
-    with open(filename, "w", newline='') as csvfile:
-        csvwriter = csv.writer(csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-
-        # Points
-        csvwriter.writerow(["Positions"])
-        data = points if not ctx.load_active else ctx.r_points
-        for p in data:
-            name, x, y = _point_to_tuple(p)
-            csvwriter.writerow([name, x, y])
-
-        # Walls
-        csvwriter.writerow([])
-        csvwriter.writerow(["Walls"])
-        if not ctx.load_active:
-            for i in range(0, len(walls), 2):
-                if i + 1 < len(walls):
-                    csvwriter.writerow([walls[i], walls[i + 1]])
-        else:
-            for p1, p2 in ctx.read_walls:
-                csvwriter.writerow([p1, p2])
-
-        # Sensors
-        csvwriter.writerow([])
-        csvwriter.writerow(["Sensors"])
-        src = sensors if not ctx.load_active else ctx.read_sensors
-        for s in src:
-            (name, x, y, typ, min_val, max_val, step, state,
-             direction, consumption, associated_device) = _sensor_to_tuple(s)
-            min_val = float(min_val)
-            max_val = float(max_val)
-            step = float(step)
-            state = float(state)
-            consumption = float(consumption) if consumption is not None else "None"
-
-            csvwriter.writerow([
-                name, x, y, typ, min_val, max_val, step, state,
-                direction if direction is not None else "None",
-                consumption, associated_device
-            ])
-
-        # Devices
-        csvwriter.writerow([])
-        csvwriter.writerow(["Devices"])
-        srcd = devices if not ctx.load_active else ctx.read_devices
-        for d in srcd:
-            (name, x, y, typ, power, state, min_c, max_c, curr_c, c_dir) = _device_to_tuple(d)
-            csvwriter.writerow([
-                name, int(x), int(y), typ, float(power), int(state),
-                float(min_c), float(max_c), float(curr_c),
-                c_dir if c_dir is not None else "None"
-            ])
-
-        # Doors
-        csvwriter.writerow([])
-        csvwriter.writerow(["Doors"])
-        srcdoors = doors if not ctx.load_active else ctx.read_doors
-        for d in srcdoors:
-            x1, y1, x2, y2, state = _door_to_tuple(d)
-            csvwriter.writerow([x1, y1, x2, y2, state])
+    if filename.lower().endswith(('.h5', '.hdf5')):
+        _write_scenario_h5(ctx, filename)
+        return
+
+    # Resolve the edit-vs-loaded sources once instead of re-testing
+    # ctx.load_active per section.
+    load = ctx.load_active
+    pts_src = points if not load else ctx.r_points
+    walls_src = list(zip(walls[0::2], walls[1::2])) if not load else ctx.read_walls
+    sens_src = sensors if not load else ctx.read_sensors
+    dev_src = devices if not load else ctx.read_devices
+    doors_src = doors if not load else ctx.read_doors
+
+    sections = (
+        ("Positions", map(_point_to_tuple, pts_src)),
+        ("Walls", walls_src),
+        ("Sensors", map(_sensor_row, sens_src)),
+        ("Devices", map(_device_row, dev_src)),
+        ("Doors", map(_door_to_tuple, doors_src)),
+    )
+
+    # Serialize each section to its own in-memory buffer (one worker per
+    # section), then concatenate them to disk in a single buffered write.
+    with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+        chunks = list(pool.map(_serialize_section, sections))
+
+    with open(filename, "w", newline='', encoding="utf-8", buffering=1 << 20) as csvfile:
+        # The blank row separating sections is just an extra line ending.
+        csvfile.write("\r\n".join(chunks))
 
     logger.info("Scenario saved successfully to %s.", filename)
     messagebox.showinfo("Saved", f"Scenario saved successfully to:\n{filename}")
@@ -362,12 +550,12 @@ def _write_scenario(ctx: AppContext, filename: str) -> None:
 
 def _clear_scenario(ctx: AppContext, canvas) -> None:
     """Internal helper: clear the scenario from canvas and memory, no confirmation."""
-    for tag in ['point', 'wall', 'sensor', 'line', 'device', 'door', 'fov']:
-        canvas.delete(tag)
+    # One Tcl round trip: delete accepts multiple tags in a single call.
+    canvas.delete('point', 'wall', 'sensor', 'line', 'device', 'door', 'fov')
 
-    for lst in [points, walls, sensors, devices, doors,
-                ctx.r_points, ctx.read_walls, ctx.read_sensors, ctx.read_devices, ctx.read_doors]:
-        lst.clear()
+    del points[:], walls[:], sensors[:], devices[:], doors[:]
+    del ctx.r_points[:], ctx.read_walls[:], ctx.read_sensors[:]
+    del ctx.read_devices[:], ctx.read_doors[:]
 
     ctx.load_active = False
     ctx.current_file = None
@@ -391,7 +579,7 @@ def open_scenario(ctx: AppContext, canvas) -> None:
     filename = filedialog.askopenfilename(
         title="Open scenario",
         defaultextension=".csv",
-        filetypes=[("Scenario files", "*.csv"), ("All files", "*.*")]
+        filetypes=[("Scenario files", "*.csv"), ("HDF5 scenario", "*.h5 *.hdf5"), ("All files", "*.*")]
     )
     if not filename:
         return  # user cancelled
@@ -402,22 +590,36 @@ def open_scenario(ctx: AppContext, canvas) -> None:
 
 
 
+# Anything outside the filename-safe set collapses to '-'.
+_SANITIZE_RE = re.compile(r'[^0-9A-Za-z._-]')
+
+# Importable data files in an S3 listing.
+_EXT_RE = re.compile(r'\.(?:csv|json|txt|log)\Z', re.IGNORECASE)
+
+
 def _sanitize(name: str) -> str:
-    return "".join(ch if ch.isalnum() or ch in "-._" else "-" for ch in (name or "").strip())
+    return _SANITIZE_RE.sub('-', (name or "").strip())
 
 def _unique_path(path: str) -> str:
     """If it already exists, add _2, _3, ... before the extension."""
-    if not os.path.exists(path):
+    # Snapshot the directory once; existence and every suffix probe are
+    # then plain set lookups with no further syscalls.
+    directory, base = os.path.split(path)
+    try:
+        names = {entry.name for entry in os.scandir(directory or '.')}
+    except FileNotFoundError:
+        return path
+    if base not in names:
         return path
-    root, ext = os.path.splitext(path)
+    root, ext = os.path.splitext(base)
     i = 2
-    while True:
-        p2 = f"{root}_{i}{ext}"
-        if not os.path.exists(p2):
-            return p2
+    while f"{root}_{i}{ext}" in names:
         i += 1
+    return os.path.join(directory, f"{root}_{i}{ext}")
 
 def _ask_choice(parent, title: str, label: str, choices: list[str], default: str | None = None) -> str | None:
+    from tkinter import ttk
+
     win = tk.Toplevel(parent) if parent else tk.Toplevel()
     win.title(title)
     win.resizable(False, False)
@@ -454,6 +656,7 @@ def _ask_choice(parent, title: str, label: str, choices: list[str], default: str
 
 def import_csv_from_s3(parent=None) -> None:
     """Import sensor CSV files from AWS S3 instead of local filesystem."""
+    from tkinter import ttk, simpledialog
     from app.io.aws_import import AWSS3Importer, BOTO3_AVAILABLE
     
     if not BOTO3_AVAILABLE:
@@ -558,7 +761,7 @@ def import_csv_from_s3(parent=None) -> None:
     
     # List CSV and JSON files in bucket
     objects = importer.list_objects(bucket)
-    data_files = [obj for obj in objects if obj.endswith(('.csv', '.json', '.txt', '.log'))]
+    data_files = list(filter(_EXT_RE.search, objects))
     
     if not data_files:
         messagebox.showwarning("No Data Files", f"No CSV/JSON files found in bucket '{bucket}'.")
@@ -578,8 +781,8 @@ def import_csv_from_s3(parent=None) -> None:
     listbox = tk.Listbox(sel_win, selectmode=tk.MULTIPLE, width=80, height=15)
     listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
     
-    for f in data_files:
-        listbox.insert(tk.END, f)
+    # One Tcl call for the whole listing instead of one per filename.
+    listbox.insert(tk.END, *data_files)
     
     selected_files = []
     
@@ -656,7 +859,11 @@ def import_csv_from_s3(parent=None) -> None:
             return
     
     imported = 0
-    all_records = []  # Collect all data from all files
+    # Each file parses into its own timestamp-keyed dict as downloads
+    # complete; the dicts are merged in selection order afterwards, so
+    # duplicate timestamps resolve deterministically (last selected file
+    # wins) no matter which download finishes first.
+    parsed_by_key: dict = {}
     failed = 0
     
     # Create progress window
@@ -678,36 +885,57 @@ def import_csv_from_s3(parent=None) -> None:
     
     progress_win.update()
     
-    for idx, s3_key in enumerate(selected_files):
-        try:
-            status_label.config(text=f"Downloading: {s3_key}")
-            progress_win.update()
-            
-            content = importer.download_csv_file(bucket, s3_key)
-            if not content:
+    # Downloads are latency-bound, so fan them out over a thread pool
+    # (boto3 clients are thread-safe) and consume results as they land.
+    # This loop runs on the Tk main thread, so updating the progress
+    # widgets directly here is safe.
+    done = 0
+    total = len(selected_files)
+    last_ui = 0.0
+    with ThreadPoolExecutor(max_workers=min(16, total)) as ex:
+        futures = {ex.submit(importer.download_csv_file, bucket, k): k for k in selected_files}
+        for fut in as_completed(futures):
+            s3_key = futures[fut]
+            try:
+                content = fut.result()
+                if not content:
+                    failed += 1
+                elif s3_key.endswith(('.json', '.txt', '.log')):
+                    # JSON lines: convert to records keyed by timestamp
+                    parsed_by_key[s3_key] = {
+                        r['timestamp']: r
+                        for r in _parse_json_to_records(content, prefix)
+                        if r.get('timestamp')
+                    }
+                    imported += 1
+                else:
+                    # Raw CSV passthrough has never survived
+                    # _save_records_to_csv (it skips 'raw_csv' records),
+                    # so there is nothing to keep in memory for it.
+                    imported += 1
+            except Exception as e:
+                logger.error(f"Error processing {s3_key}: {e}")
                 failed += 1
-                continue
-
-            # Check if JSON and convert to CSV format if needed
-            if s3_key.endswith(('.json', '.txt', '.log')):
-                records = _parse_json_to_records(content, prefix)
-                all_records.extend(records)
-            else:
-                # It's already CSV, just append content
-                all_records.append({'raw_csv': content})
-            
-            imported += 1
-        except Exception as e:
-            logger.error(f"Error processing {s3_key}: {e}")
-            failed += 1
-        finally:
-            progress_bar['value'] = idx + 1
-            progress_label.config(text=f"{idx + 1} / {len(selected_files)}")
-            progress_win.update()
+            finally:
+                done += 1
+                # Each update() drains the Tk event loop; refreshing at
+                # ~10 Hz keeps the bar live without paying that per file.
+                now = time.monotonic()
+                if now - last_ui > 0.1 or done == total:
+                    last_ui = now
+                    status_label.config(text=f"Downloaded: {s3_key}")
+                    progress_bar['value'] = done
+                    progress_label.config(text=f"{done} / {total}")
+                    progress_win.update()
     
     progress_win.destroy()
-    
-    if not all_records:
+
+    # Merge in selection order (same rule as the local import path).
+    new_records: dict = {}
+    for s3_key in selected_files:
+        new_records.update(parsed_by_key.get(s3_key, ()))
+
+    if not new_records:
         messagebox.showerror("Import Failed", f"No data could be extracted from selected files.\n\nSuccessful: {imported}\nFailed: {failed}")
         return
     
@@ -733,11 +961,11 @@ def import_csv_from_s3(parent=None) -> None:
     append_mode = (action == 'append')
     
     try:
-        _save_records_to_csv(all_records, dest_path, prefix, device_name=original_name, ip=device_ip, append_mode=append_mode)
-        logger.info("Imported %d records from S3 to: %s (mode: %s)", len(all_records), dest_path, action)
+        _save_records_to_csv(list(new_records.values()), dest_path, prefix, device_name=original_name, ip=device_ip, append_mode=append_mode)
+        logger.info("Imported %d records from S3 to: %s (mode: %s)", len(new_records), dest_path, action)
         messagebox.showinfo(
             "Import Complete", 
-            f"Successfully imported {len(all_records)} records from {imported} file(s) to:\n{dest_path}\n"
+            f"Successfully imported {len(new_records)} records from {imported} file(s) to:\n{dest_path}\n"
             f"Mode: {action.capitalize()}\n\n"
             f"Failed: {failed} file(s)"
         )
@@ -748,6 +976,8 @@ def import_csv_from_s3(parent=None) -> None:
 
 def import_csv(parent=None) -> None:
     """Import sensor CSV files from local filesystem."""
+    from tkinter import simpledialog
+
     files = filedialog.askopenfilenames(
         title="Import CSV files",
         filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
@@ -811,7 +1041,7 @@ def import_csv(parent=None) -> None:
     existing_data = {}
     if append_mode and os.path.exists(dest_path):
         try:
-            with open(dest_path, 'r', newline='', encoding='utf-8') as f:
+            with open(dest_path, 'r', newline='', encoding='utf-8', buffering=1 << 20) as f:
                 reader = csv.reader(f)
                 header = next(reader, None)
                 for row in reader:
@@ -820,40 +1050,47 @@ def import_csv(parent=None) -> None:
         except Exception as e:
             logger.warning("Failed to read existing file for dedup: %s", e)
     
-    # Collect all new data
-    all_new_data = {}
-    imported = 0
-    for src in files:
+    # Parse the selected files in parallel (this is I/O bound), then merge
+    # in selection order so later files still win on duplicate timestamps.
+    def _read_rows(src: str) -> tuple:
         try:
-            with open(src, 'r', newline='', encoding='utf-8') as src_file:
+            rows = {}
+            with open(src, 'r', newline='', encoding='utf-8', buffering=1 << 20) as src_file:
                 reader = csv.reader(src_file)
-                header = next(reader, None)  # Skip header
+                header = next(reader, None)
                 for row in reader:
                     if row and row[0] and row[0].strip():  # Validate timestamp
-                        all_new_data[row[0]] = row  # Keep latest within import
-            
-            logger.info("Imported %s -> %s (mode: %s)", src, dest_path, action if imported == 0 else 'append')
-            imported += 1
+                        rows[row[0]] = row  # Keep latest within file
+            return header, rows
         except Exception as e:
             logger.exception("Failed to import %s: %s", src, e)
+            return None, None
+
+    all_new_data = {}
+    header_row = None
+    imported = 0
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+        for src, (header, rows) in zip(files, pool.map(_read_rows, files)):
+            if rows is None:
+                continue
+            if header_row is None and header:
+                header_row = header
+            all_new_data.update(rows)
+            logger.info("Imported %s -> %s (mode: %s)", src, dest_path, action if imported == 0 else 'append')
+            imported += 1
     
     # Merge: existing_data + all_new_data (new data overwrites duplicates)
     merged_data = {**existing_data, **all_new_data}
     
     # Write merged data to file
     try:
-        with open(dest_path, 'w', newline='', encoding='utf-8') as dest_file:
+        with open(dest_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as dest_file:
             writer = csv.writer(dest_file)
-            # Write header
-            if files:
-                with open(files[0], 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    header = next(reader, None)
-                    if header:
-                        writer.writerow(header)
+            # Header captured during the parse pass; no re-open of files[0]
+            if header_row:
+                writer.writerow(header_row)
             # Write all merged rows (sorted by timestamp)
-            for ts in sorted(merged_data.keys()):
-                writer.writerow(merged_data[ts])
+            writer.writerows(map(merged_data.__getitem__, sorted(merged_data)))
     except Exception as e:
         logger.exception("Failed to write merged data: %s", e)
         messagebox.showerror("Import Failed", f"Error writing data: {e}")
@@ -867,19 +1104,31 @@ def export_simulation_csv() -> None:
         messagebox.showwarning("No logs", "Folder 'saves' not found.\nStart a manual simulation before exporting.")
         return
 
-    candidates = []
-    for root, _dirs, files in os.walk(logs_root):
-        if "interactions.csv" in files:
-            csv_path = os.path.join(root, "interactions.csv")
-            candidates.append((os.path.getmtime(csv_path), csv_path))
+    # One scandir pass over the save folders: each save lives in its own
+    # subdirectory, so there is no need for a full os.walk tree traversal.
+    # Only the newest file matters, so keep a running max instead of
+    # collecting and sorting every candidate.
+    src_csv = None
+    newest = -1.0
+    with os.scandir(logs_root) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            csv_path = os.path.join(entry.path, "interactions.csv")
+            try:
+                st = os.stat(csv_path)
+            except FileNotFoundError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            if st.st_mtime > newest:
+                newest = st.st_mtime
+                src_csv = csv_path
 
-    if not candidates:
+    if src_csv is None:
         messagebox.showwarning("No file", "'interactions.csv' not found.\nStart a manual simulation and retry.")
         return
 
-    candidates.sort(reverse=True)
-    src_csv = candidates[0][1]
-
     dest = filedialog.asksaveasfilename(
         title="Export simulation (CSV)",
         defaultextension=".csv",
@@ -890,7 +1139,23 @@ def export_simulation_csv() -> None:
         return
 
     try:
-        shutil.copyfile(src_csv, dest)
+        with open(src_csv, 'rb', buffering=1 << 20) as s, open(dest, 'wb', buffering=1 << 20) as d:
+            try:
+                # Zero-copy path: the kernel moves the bytes between the
+                # descriptors without bouncing them through userspace.
+                offset = 0
+                size = os.fstat(s.fileno()).st_size
+                while offset < size:
+                    sent = os.sendfile(d.fileno(), s.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except (AttributeError, OSError):
+                # Not available (non-Linux, odd filesystems): plain copy.
+                s.seek(0)
+                d.seek(0)
+                d.truncate()
+                shutil.copyfileobj(s, d, length=1 << 20)
         messagebox.showinfo("Exported", f"File exported to:\n{dest}")
         logger.info("Exported interactions CSV to %s", dest)
     except Exception as e:
@@ -906,7 +1171,7 @@ def save_scenario_as(ctx: AppContext) -> None:
         defaultextension=".csv",
         initialfile="saved.csv",
         initialdir=str(houses_dir),
-        filetypes=[("Scenario files", "*.csv"), ("All files", "*.*")]
+        filetypes=[("Scenario files", "*.csv"), ("HDF5 scenario", "*.h5 *.hdf5"), ("All files", "*.*")]
     )
     if not filename:
         return
@@ -920,4 +1185,5 @@ def save_scenario(ctx: AppContext) -> None:
     if not ctx.current_file:
         save_scenario_as(ctx)
     else:
-        _write_scenario(ctx, ctx.current_file)
\ No newline at end of file
+        # Plain Save on an already-open file: no confirmation round trip.
+        _write_scenario(ctx, ctx.current_file, confirm=False)
\ No newline at end of file
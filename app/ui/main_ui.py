@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import partial
 import tkinter as tk
 from tkinter import Menu
 from PIL import ImageTk, Image
@@ -128,44 +129,44 @@ def build_home_ui(ctx: AppContext):
     file_menu = Menu(menu_bar, tearoff=0)
     ctx.file_menu = file_menu
     menu_bar.add_cascade(label="File", menu=file_menu)
-    file_menu.add_command(label="New", command=lambda: delete_scenario(ctx, ctx.canvas))
-    file_menu.add_command(label="Open file", command=lambda: open_scenario(ctx, ctx.canvas))
-    file_menu.add_command(label="Load default (saved.csv)", command=lambda: load_scenario_from_file(ctx, ctx.canvas))
+    file_menu.add_command(label="New", command=partial(delete_scenario, ctx, canvas))
+    file_menu.add_command(label="Open file", command=partial(open_scenario, ctx, canvas))
+    file_menu.add_command(label="Load default (saved.csv)", command=partial(load_scenario_from_file, ctx, canvas))
     file_menu.add_separator()
-    file_menu.add_command(label="Save", command=lambda: save_scenario(ctx))
-    file_menu.add_command(label="Save As", command=lambda: save_scenario_as(ctx))
+    file_menu.add_command(label="Save", command=partial(save_scenario, ctx))
+    file_menu.add_command(label="Save As", command=partial(save_scenario_as, ctx))
     file_menu.add_separator()
-    file_menu.add_command(label="Exit", command=lambda: exit_app(ctx))
+    file_menu.add_command(label="Exit", command=partial(exit_app, ctx))
 
     # Scenario menu
     scenario_menu = Menu(menu_bar, tearoff=0)
     menu_bar.add_cascade(label="Scenario", menu=scenario_menu)
     ctx.scenario_menu = scenario_menu
 
-    scenario_menu.add_command(label="Add points", command=lambda: _menu_add_point(ctx))
-    scenario_menu.add_command(label="Add devices", command=lambda: _menu_add_device(ctx))
-    scenario_menu.add_command(label="Add walls", command=lambda: _menu_add_wall(ctx))
-    scenario_menu.add_command(label="Add doors", command=lambda: _menu_add_door(ctx))
-    scenario_menu.add_command(label="Add sensors", command=lambda: _menu_add_sensor(ctx))
+    scenario_menu.add_command(label="Add points", command=partial(_menu_add_point, ctx))
+    scenario_menu.add_command(label="Add devices", command=partial(_menu_add_device, ctx))
+    scenario_menu.add_command(label="Add walls", command=partial(_menu_add_wall, ctx))
+    scenario_menu.add_command(label="Add doors", command=partial(_menu_add_door, ctx))
+    scenario_menu.add_command(label="Add sensors", command=partial(_menu_add_sensor, ctx))
 
     # Simulation menu
     sim_menu = Menu(menu_bar, tearoff=0)
     ctx.simulation_menu = sim_menu
     menu_bar.add_cascade(label="Simulation", menu=sim_menu)
-    sim_menu.add_command(label="Automatic", command=lambda: launch_automatic_interface(ctx))
-    sim_menu.add_command(label="Manual", command=lambda: start_sim(ctx))
-    sim_menu.add_command(label="LLM Smart Meter", command=lambda: open_llm_smartmeter_ui(ctx))
+    sim_menu.add_command(label="Automatic", command=partial(launch_automatic_interface, ctx))
+    sim_menu.add_command(label="Manual", command=partial(start_sim, ctx))
+    sim_menu.add_command(label="LLM Smart Meter", command=partial(open_llm_smartmeter_ui, ctx))
     sim_menu.add_separator()
     sim_menu.add_command(label="Generate log", command=lambda: __import__("log").show_log(ctx.canvas, sensor_states, ctx.load_active))
     sim_menu.add_command(label="Activity Log", command=lambda: __import__("log").show_activity_log())
     sim_menu.add_command(label="Generate graphs", command=lambda: __import__("graph").show_graphs(ctx.canvas, sensor_states))
     sim_menu.add_separator()
-    sim_menu.add_command(label="Import sensor CSV from S3", command=lambda: import_csv_from_s3(ctx.window))
-    sim_menu.add_command(label="Import sensor CSV (local)", command=lambda: import_csv(ctx.window))
-    sim_menu.add_command(label="Export simulations (CSV)", command=lambda: export_simulation_csv())
+    sim_menu.add_command(label="Import sensor CSV from S3", command=partial(import_csv_from_s3, ctx.window))
+    sim_menu.add_command(label="Import sensor CSV (local)", command=partial(import_csv, ctx.window))
+    sim_menu.add_command(label="Export simulations (CSV)", command=export_simulation_csv)
     sim_menu.add_separator()
-    sim_menu.add_command(label="Bind Smart Meter (IP → sensor)", command=lambda: open_bind_ip_ui(ctx.window, sensor_states))
-    sim_menu.add_command(label="Bind DHT22 (GPIO → sensor)", command=lambda: open_bind_dht_ui(ctx.window, sensor_states))
+    sim_menu.add_command(label="Bind Smart Meter (IP → sensor)", command=partial(open_bind_ip_ui, ctx.window, sensor_states))
+    sim_menu.add_command(label="Bind DHT22 (GPIO → sensor)", command=partial(open_bind_dht_ui, ctx.window, sensor_states))
 
 
 
@@ -1,6 +1,9 @@
 import tkinter as tk
 from utils import draw_sensor
 import csv
+import io
+import mmap
+import re
 
 # Global lists to save data read from file
 coordinates = []
@@ -9,99 +12,98 @@ read_sensors = []
 read_devices = []
 read_doors = []
 
-def read_coordinates_from_file(file_path):
-    # Variable to track the current section
-    current_section = None
-
-    with open(file_path, "r") as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            # Skip empty rows
-            if not row:
-                continue
-            section_name = row[0].strip().lower()
-            if section_name == "positions":
-                current_section = "Positions"
-                continue
-            elif section_name == "walls":
-                current_section = "Walls"
-                continue
-            elif section_name == "sensors":
-                current_section = "Sensors"
-                continue
-            elif section_name == "devices":
-                current_section = "Devices"
+# Section headers sit alone on their own line in the scenario file.
+_SECTION_RE = re.compile(rb'^(Positions|Walls|Sensors|Devices|Doors)\s*$',
+                         re.IGNORECASE | re.MULTILINE)
+
+
+def _parse_positions(rows):
+    for row in rows:
+        try:
+            name_p, x_p, y_p = row
+            coordinates.append((name_p, int(x_p), int(y_p)))
+        except ValueError:
+            print(f"Error in Positions row: {row}")
+
+
+def _parse_walls(rows):
+    for row in rows:
+        try:
+            point1, point2 = row
+            read_walls.append((point1, point2))
+        except ValueError:
+            print(f"Error in Walls row: {row}")
+
+
+def _parse_sensors(rows):
+    for row in rows:
+        try:
+            if len(row) < 11:
+                print(f"Sensors row incomplete: {row}")
                 continue
-            elif section_name == "doors":
-                current_section = "Doors"
+            (name_s, x_s, y_s, type, min_val, max_val, step, state_s,
+             direction, consumption, associated_device) = row
+            # direction/consumption: "None" or empty means None, otherwise float
+            direction = None if direction in ("", "None") else float(direction)
+            consumption = None if consumption in ("", "None") else float(consumption)
+            read_sensors.append((name_s, int(x_s), int(y_s), type,
+                                 float(min_val), float(max_val), float(step), float(state_s),
+                                 direction, consumption, associated_device))
+        except ValueError:
+            print(f"Error in Sensors row: {row}")
+
+
+def _parse_devices(rows):
+    for row in rows:
+        try:
+            if len(row) < 10:
+                print(f"Devices row incomplete: {row}")
                 continue
+            (name_d, x_d, y_d, type_d, power, state_d, min_consumption,
+             max_consumption, current_consumption, consumption_direction) = row
+            read_devices.append((name_d, int(x_d), int(y_d), type_d,
+                                 int(float(power)), int(state_d),
+                                 int(float(min_consumption)), int(float(max_consumption)),
+                                 int(float(current_consumption)), int(consumption_direction)))
+        except ValueError:
+            print(f"Error Devices row: {row}")
+
+
+def _parse_doors(rows):
+    for row in rows:
+        try:
+            x1_p, y1_p, x2_p, y2_p, state_p = row
+            read_doors.append((int(x1_p), int(y1_p), int(x2_p), int(y2_p), state_p))
+        except ValueError:
+            print(f"Error in Doors row: {row}")
 
-            if current_section == "Positions":
-                try:
-                    name_p, x_p, y_p = row
-                    x_p = int(x_p)
-                    y_p = int(y_p)
-                    coordinates.append((name_p, x_p, y_p))
-                except ValueError:
-                    print(f"Error in Positions row: {row}")
-
-            elif current_section == "Walls":
-                try:
-                    point1, point2 = row
-                    read_walls.append((point1, point2))
-                except ValueError:
-                    print(f"Error in Walls row: {row}")
-
-            elif current_section == "Sensors":
-                try:
-                    if len(row) < 11:
-                        print(f"Sensors row incomplete: {row}")
-                        continue
-                    (name_s, x_s, y_s, type, min_val, max_val, step, state_s,
-                     direction, consumption, associated_device) = row
-                    x_s = int(x_s)
-                    y_s = int(y_s)
-                    min_val = float(min_val)
-                    max_val = float(max_val)
-                    step = float(step)
-                    state_s = float(state_s)
-                    # the direction field: if "None" or empty, set None, otherwise convert to float
-                    direction = None if direction in ("", "None") else float(direction)
-                    # the consumption field: if "None"or empty, set None, otherwise converted to float
-                    consumption = None if consumption in ("", "None") else float(consumption)
-                    read_sensors.append((name_s, x_s, y_s, type, min_val, max_val, step, state_s, direction, consumption, associated_device))
-                except ValueError:
-                    print(f"Error in Sensors row: {row}")
-
-            elif current_section == "Devices":
-                try:
-                    if len(row) < 10:
-                        print(f"Devices row incomplete: {row}")
-                        continue
-                    (name_d, x_d, y_d, type_d, power, state_d, min_consumption,
-                     max_consumption, current_consumption, consumption_direction) = row
-                    x_d = int(x_d)
-                    y_d = int(y_d)
-                    power = int(float(power))
-                    state_d = int(state_d)
-                    min_consumption = int(float(min_consumption))
-                    max_consumption = int(float(max_consumption))
-                    current_consumption = int(float(current_consumption))
-                    consumption_direction = int(consumption_direction)
-                    read_devices.append((name_d, x_d, y_d, type_d, power, state_d, min_consumption, max_consumption, current_consumption, consumption_direction))
-                except ValueError:
-                    print(f"Error Devices row: {row}")
-
-            elif current_section == "Doors":
-                try:
-                    x1_p, y1_p, x2_p, y2_p, state_p = row
-                    x1_p = int(x1_p)
-                    y1_p = int(y1_p)
-                    x2_p = int(x2_p)
-                    y2_p = int(y2_p)
-                    read_doors.append((x1_p, y1_p, x2_p, y2_p, state_p))
-                except ValueError:
-                    print(f"Error in Doors row: {row}")
+
+_SECTION_PARSERS = {
+    "positions": _parse_positions,
+    "walls": _parse_walls,
+    "sensors": _parse_sensors,
+    "devices": _parse_devices,
+    "doors": _parse_doors,
+}
+
+
+def read_coordinates_from_file(file_path):
+    # mmap the file and locate the section headers with one regex scan;
+    # each section slice is then parsed directly, skipping the per-row
+    # section-name comparisons of the old single-pass loop.
+    with open(file_path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return coordinates, read_walls, read_sensors, read_devices, read_doors
+        with buf:
+            headers = list(_SECTION_RE.finditer(buf))
+            for i, m in enumerate(headers):
+                start = m.end()
+                end = headers[i + 1].start() if i + 1 < len(headers) else len(buf)
+                parse = _SECTION_PARSERS[m.group(1).decode('ascii').lower()]
+                body = buf[start:end].decode('utf-8')
+                parse(row for row in csv.reader(io.StringIO(body, newline='')) if row)
     return coordinates, read_walls, read_sensors, read_devices, read_doors
 
 def draw_points(coordinates, canvas):